@@ -1,15 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import asyncio
+import httpx
 import time
 from datetime import datetime
+from csv_store import append_jobs
+from parquet_store import save_parquet
+from http_client import create_client, http_sites, reset_hosts, scrape_site_http
 import os
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0"
-}
-
 CSV_FILE = "jobs.csv"
+
+DEDUPE_FIELDS = ["title", "company", "location", "source"]
 SOURCE_FILE = "sources.txt"
 
 
@@ -51,250 +51,42 @@ def load_sources():
 
 
 # ==============================
-# JOBS.CH SCRAPER
-# ==============================
-def scrape_jobs_ch(keyword, location, max_pages=50):
-    base_url = "https://www.jobs.ch/en/vacancies/"
-    jobs = []
-
-    for page in range(1, max_pages + 1):
-        params = {
-            "term": keyword,
-            "location": location,
-            "page": page
-        }
-
-        print(f"[jobs.ch] {keyword} / {location} Page {page}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        cards = soup.select("a[data-cy='job-link']")
-        if not cards:
-            print("No more results.")
-            break
-
-        for card in cards:
-            title = card.get_text(strip=True)
-            link = "https://www.jobs.ch" + card.get("href", "")
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobs.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        time.sleep(1)
-
-    print(f"[jobs.ch] Found {len(jobs)} jobs\n")
-    return jobs
-
-
-# ==============================
-# INDEED SCRAPER
-# ==============================
-def scrape_indeed(keyword, location="", max_pages=5):
-    base_url = "https://ch.indeed.com/jobs"
-    jobs = []
-
-    session = requests.Session()
-    session.headers.update(HEADERS)
-
-    for page in range(max_pages):
-        start = page * 10
-
-        params = {
-            "q": keyword,
-            "start": start
-        }
-
-        if location:
-            params["l"] = location
-
-        print(f"[indeed] {keyword} / {location or 'ANY'} Page {page + 1}")
-
-        response = session.get(base_url, params=params, timeout=30)
-
-        print("Status:", response.status_code)
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        job_cards = soup.select("div.job_seen_beacon")
-        print(f"Found {len(job_cards)} job cards")
-
-        if not job_cards:
-            break
-
-        for card in job_cards:
-            title_el = card.select_one("h2 a span")
-            company_el = card.select_one("[data-testid='company-name']")
-            location_el = card.select_one("[data-testid='text-location']")
-
-            title = title_el.get_text(strip=True) if title_el else ""
-            company = company_el.get_text(strip=True) if company_el else ""
-            job_loc = location_el.get_text(strip=True) if location_el else ""
-
-            link_el = card.select_one("h2 a")
-            link = ""
-            if link_el:
-                href = link_el.get("href")
-                if href:
-                    link = "https://ch.indeed.com" + href
-
-            if title:
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": job_loc,
-                    "link": link,
-                    "source": "indeed.ch",
-                    "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-
-        time.sleep(2)
-
-    print(f"[indeed] Found {len(jobs)} jobs\n")
-    return jobs
-
-
-
-# ==============================
-# JOBSCOUT24 SCRAPER
+# CSV STORAGE
 # ==============================
-def scrape_jobscout24(keyword, location, max_pages=50):
-    base_url = "https://www.jobscout24.ch/en/jobs"
-    jobs = []
+def save_to_csv(jobs):
+    new_jobs = append_jobs(jobs, DEDUPE_FIELDS, CSV_FILE)
+    save_parquet(new_jobs, CSV_FILE)
+    print(f"CSV updated. {len(new_jobs)} new entries.\n")
 
-    for page in range(1, max_pages + 1):
-        params = {
-            "term": keyword,
-            "location": location,
-            "page": page
-        }
-
-        print(f"[jobscout24] {keyword} / {location} Page {page}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        cards = soup.select("a[href*='/en/job/']")
-        if not cards:
-            print("No more results.")
-            break
-
-        for card in cards:
-            title = card.get_text(strip=True)
-            link = card.get("href")
-
-            if link and not link.startswith("http"):
-                link = "https://www.jobscout24.ch" + link
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobscout24.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        time.sleep(1)
-
-    print(f"[jobscout24] Found {len(jobs)} jobs\n")
-    return jobs
 
 # ==============================
-# JOBAGENT SCRAPER
+# MAIN SCRAPER
 # ==============================
-def scrape_jobagent(keyword, location, max_pages=5):
-    """
-    For jobagent:
-    keyword = category slug (e.g. administration-verwaltung)
-    location is ignored (site does not support it in URL)
-    """
-    base_url = f"https://www.jobagent.ch/{keyword}-jobs"
+async def scrape_source(client, site, keyword, location):
     jobs = []
 
-    for page in range(1, max_pages + 1):
-        url = f"{base_url}?page={page}"
-        print(f"[jobagent] {keyword} Page {page}")
-
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            soup = BeautifulSoup(response.text, "html.parser")
-        except Exception as e:
-            print(f"Error loading page: {e}")
-            break
-
-        job_links = soup.select("a[href*='/job/']")
-
-        if not job_links:
-            print("No more results.")
-            break
-
-        for link_el in job_links:
-            title = link_el.get_text(strip=True)
-            link = link_el.get("href")
-
-            if not link:
-                continue
-
-            if not link.startswith("http"):
-                link = "https://www.jobagent.ch" + link
-
-            # Extract surrounding text for company/location
-            parent = link_el.parent
-            text_block = parent.get_text(" ", strip=True)
+    try:
+        async for page_jobs in scrape_site_http(client, site, keyword, location):
+            jobs.extend(page_jobs)
+    except httpx.HTTPError as e:
+        print(f"[{site}] {keyword} / {location} failed: {e}")
 
-            company = ""
-            job_loc = ""
-
-            parts = text_block.split(title)
-            if len(parts) > 1:
-                remainder = parts[1].strip()
-                pieces = remainder.split()
-                if len(pieces) > 1:
-                    job_loc = pieces[0]
-                    company = " ".join(pieces[1:])
-
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": job_loc,
-                "link": link,
-                "source": "jobagent.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        time.sleep(1)
-
-    print(f"[jobagent] Found {len(jobs)} jobs\n")
+    print(f"[{site}] Found {len(jobs)} jobs\n")
     return jobs
 
 
-# ==============================
-# CSV STORAGE
-# ==============================
-def save_to_csv(jobs):
-    new_df = pd.DataFrame(jobs)
+async def crawl(sources):
+    reset_hosts()
 
-    if os.path.exists(CSV_FILE):
-        existing_df = pd.read_csv(CSV_FILE)
-        combined = pd.concat([existing_df, new_df], ignore_index=True)
-    else:
-        combined = new_df
-
-    text_fields = ["title", "company", "location", "source"]
-    combined.drop_duplicates(subset=text_fields, inplace=True)
+    async with create_client() as client:
+        # Sources run side by side, the host limits keep every site at its pace
+        results = await asyncio.gather(
+            *(scrape_source(client, site, keyword, location) for site, keyword, location in sources)
+        )
 
-    combined.to_csv(CSV_FILE, index=False)
-    print(f"CSV updated. Total entries: {len(combined)}\n")
+    return [job for jobs in results for job in jobs]
 
 
-# ==============================
-# MAIN SCRAPER
-# ==============================
 def run_scraper():
     print(f"\nBeep boop d maschine isch am dänke {datetime.now()}")
 
@@ -303,18 +95,17 @@ def run_scraper():
         print("No valid sources found.\n")
         return
 
-    all_jobs = []
+    # Sites are described in site_registry.SITES, only those served as plain HTML run here
+    sites = http_sites()
+
+    known_sources = []
     for site, keyword, location in sources:
-        if site == "jobs.ch":
-            all_jobs.extend(scrape_jobs_ch(keyword, location))
-        elif site == "indeed.ch":
-            all_jobs.extend(scrape_indeed(keyword, location))
-        elif site == "jobscout24.ch":
-            all_jobs.extend(scrape_jobscout24(keyword, location))
-        elif site == "jobagent.ch":
-            all_jobs.extend(scrape_jobagent(keyword, location))
+        if site in sites:
+            known_sources.append((site, keyword, location))
         else:
-            print(f"Unknown site: {site}")
+            print(f"Skipping {site}, it needs the browser (playwright_multisite.py) or is unknown")
+
+    all_jobs = asyncio.run(crawl(known_sources))
 
     if all_jobs:
         save_to_csv(all_jobs)
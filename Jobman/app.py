@@ -1,12 +1,17 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, Response
 from werkzeug.security import check_password_hash, generate_password_hash
 import sqlite3
-import pandas as pd
 import os
+import json
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import Future
 from functools import wraps
+from queries import PAGE_SIZE, count_jobs, fetch_jobs_page
+from db import connect, init_db
 
 
 app = Flask(__name__)
@@ -14,6 +19,8 @@ app.secret_key = "change-this-to-a-random-secret"
 
 DB_FILE = "jobs.db"
 
+init_db()
+
 def role_required(role):
     def decorator(func):
         @wraps(func)
@@ -21,7 +28,8 @@ def role_required(role):
             if "user_id" not in session:
                 return redirect(url_for("login"))
 
-            if session.get("role") != role:
+            identity = get_user_identity(session["user_id"])
+            if not identity or identity["role"] != role:
                 return "Access denied", 403
 
             return func(*args, **kwargs)
@@ -29,10 +37,94 @@ def role_required(role):
     return decorator
 
 def get_db():
-    return sqlite3.connect(DB_FILE)
+    # One connection per request, closed again in close_db()
+    if "db" not in g:
+        g.db = connect(DB_FILE)
+    return g.db
+
+@app.teardown_appcontext
+def close_db(exception):
+    conn = g.pop("db", None)
+    if conn is not None:
+        conn.close()
+
+# ==============================
+# REVISIONS / ETAGS
+# ==============================
+def get_revision(conn, user_id, resource):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT revision
+        FROM revisions
+        WHERE user_id = ?
+        AND resource = ?
+    """, (user_id, resource))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def bump_revision(conn, user_id, resource):
+    # Called inside the writing transaction, committed together with it
+    conn.execute("""
+        INSERT INTO revisions (user_id, resource, revision)
+        VALUES (?, ?, 1)
+        ON CONFLICT (user_id, resource)
+        DO UPDATE SET revision = revision + 1
+    """, (user_id, resource))
+
+def revision_etag(user_id, resource, revision):
+    return f"{resource}-{user_id}-{revision}"
+
+def resource_etag(conn, resource):
+    user_id = session["user_id"]
+    return revision_etag(user_id, resource, get_revision(conn, user_id, resource))
+
+def etag_response(response, etag):
+    # no-cache makes the browser revalidate with If-None-Match every time
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+# user_id -> {"username", "role"}, filled at login so hot routes skip the users table
+_user_cache = {}
+
+def get_user_identity(user_id):
+    identity = _user_cache.get(user_id)
+    if identity is not None:
+        return identity
+
+    cursor = get_db().cursor()
+    cursor.execute("""
+        SELECT username, role
+        FROM users
+        WHERE id = ?
+    """, (user_id,))
+    row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    identity = {"username": row[0], "role": row[1]}
+    _user_cache[user_id] = identity
+    return identity
+
+def forget_user_identity(user_id):
+    _user_cache.pop(user_id, None)
+
+def parse_user_id(value):
+    # Ids from admin request bodies, None when it isn't a number
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 def current_user_role():
-    return session.get("role", "user")
+    identity = get_user_identity(session["user_id"]) if "user_id" in session else None
+    return identity["role"] if identity else "user"
+
+@app.context_processor
+def inject_user_role():
+    # Templates show admin controls from the same cached role the routes check
+    return {"user_role": current_user_role()}
   
 @app.route("/api/admin/user/reset-password", methods=["POST"])
 @role_required("admin")
@@ -57,7 +149,6 @@ def api_admin_reset_password():
     ))
 
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -89,21 +180,13 @@ def api_admin_create_user():
 
         conn.commit()
     except Exception as e:
-        conn.close()
         return jsonify({"status": "error", "message": "User exists"}), 400
 
-    conn.close()
     return jsonify({"status": "ok"})
   
 
   
 
-def load_jobs():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT * FROM jobs", conn)
-    conn.close()
-    return df
-
 @app.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
@@ -119,11 +202,10 @@ def login():
             WHERE username = ?
         """, (username,))
         user = cursor.fetchone()
-        conn.close()
 
         if user and check_password_hash(user[1], password):
             session["user_id"] = user[0]
-            session["role"] = user[2]
+            _user_cache[user[0]] = {"username": username, "role": user[2]}
             return redirect(url_for("index"))
 
         return render_template("login.html", error="Invalid credentials")
@@ -146,43 +228,53 @@ def index():
     if "user_id" not in session:
         return redirect(url_for("login"))
 
-    # Get username of logged-in user
+    identity = get_user_identity(session["user_id"])
+    username = identity["username"] if identity else "unknown"
+
+    keyword = request.args.get("keyword", "").strip()
+    location = request.args.get("location", "").strip()
+    source = request.args.get("source", "").strip()
+
     conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT username
-        FROM users
-        WHERE id = ?
-    """, (session["user_id"],))
-    row = cursor.fetchone()
-    conn.close()
+    total_jobs = count_jobs(conn, keyword, location, source)
+    jobs, next_cursor = fetch_jobs_page(conn, keyword, location, source)
 
-    username = row[0] if row else "unknown"
+    return render_template(
+        "index.html",
+        jobs=jobs,
+        next_cursor=next_cursor,
+        total_jobs=total_jobs,
+        username=username,
+        keyword=keyword,
+        location=location,
+        source=source
+    )
 
-    df = load_jobs()
+@app.route("/api/jobs", methods=["GET"])
+def api_get_jobs():
+    if "user_id" not in session:
+        return jsonify({"status": "error"}), 403
 
-    keyword = request.args.get("keyword", "").lower()
-    location = request.args.get("location", "").lower()
-    source = request.args.get("source", "").lower()
+    keyword = request.args.get("keyword", "").strip()
+    location = request.args.get("location", "").strip()
+    source = request.args.get("source", "").strip()
+    cursor = request.args.get("cursor")
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), 500)
 
-    if keyword:
-        df = df[df["title"].str.lower().str.contains(keyword, na=False)]
+    conn = get_db()
 
-    if location:
-        df = df[df["location"].str.lower().str.contains(location, na=False)]
+    try:
+        jobs, next_cursor = fetch_jobs_page(conn, keyword, location, source, cursor, limit)
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid cursor"}), 400
 
-    if source:
-        df = df[df["source"].str.lower().str.contains(source, na=False)]
+    data = {"jobs": jobs, "next_cursor": next_cursor}
 
-    total_jobs = len(df)
+    # The total only matters for the first page, deeper pages skip the count
+    if not cursor:
+        data["total"] = count_jobs(conn, keyword, location, source)
 
-    jobs = df.sort_values(by="scraped_at", ascending=False).to_dict(orient="records")
-    return render_template(
-        "index.html",
-        jobs=jobs,
-        total_jobs=total_jobs,
-        username=username
-    )
+    return jsonify(data)
 
 @app.route("/api/favorites", methods=["GET"])
 def api_get_favorites():
@@ -190,6 +282,11 @@ def api_get_favorites():
         return jsonify([])
 
     conn = get_db()
+
+    etag = resource_etag(conn, "favorites")
+    if request.if_none_match.contains(etag):
+        return etag_response(app.response_class(status=304), etag)
+
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -199,10 +296,9 @@ def api_get_favorites():
     """, (session["user_id"],))
 
     rows = cursor.fetchall()
-    conn.close()
 
     data = [{"link": r[0], "title": r[1]} for r in rows]
-    return jsonify(data)
+    return etag_response(jsonify(data), etag)
 
 
 @app.route("/api/favorites/add", methods=["POST"])
@@ -217,8 +313,9 @@ def api_add_favorite():
     conn = get_db()
     cursor = conn.cursor()
 
+    # A job that is already a favorite stays as it is
     cursor.execute("""
-        INSERT INTO favorites (user_id, job_link, title, created_at)
+        INSERT OR IGNORE INTO favorites (user_id, job_link, title, created_at)
         VALUES (?, ?, ?, ?)
     """, (
         session["user_id"],
@@ -227,8 +324,9 @@ def api_add_favorite():
         datetime.now().isoformat()
     ))
 
+    if cursor.rowcount:
+        bump_revision(conn, session["user_id"], "favorites")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -249,8 +347,8 @@ def api_remove_favorite():
         AND user_id = ?
     """, (link, session["user_id"]))
 
+    bump_revision(conn, session["user_id"], "favorites")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -261,6 +359,11 @@ def api_get_tasks():
         return jsonify([])
 
     conn = get_db()
+
+    etag = resource_etag(conn, "tasks")
+    if request.if_none_match.contains(etag):
+        return etag_response(app.response_class(status=304), etag)
+
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -271,7 +374,6 @@ def api_get_tasks():
     """, (session["user_id"],))
 
     rows = cursor.fetchall()
-    conn.close()
 
     tasks = []
     for r in rows:
@@ -283,7 +385,7 @@ def api_get_tasks():
             "done": bool(r[4])
         })
 
-    return jsonify(tasks)
+    return etag_response(jsonify(tasks), etag)
 
 @app.route("/api/tasks/add", methods=["POST"])
 def api_add_task():
@@ -307,8 +409,8 @@ def api_add_task():
         datetime.now().isoformat()
     ))
 
+    bump_revision(conn, session["user_id"], "tasks")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -329,8 +431,8 @@ def api_delete_task():
         AND user_id = ?
     """, (task_id, session["user_id"]))
 
+    bump_revision(conn, session["user_id"], "tasks")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -352,8 +454,8 @@ def api_toggle_task():
         AND user_id = ?
     """, (task_id, session["user_id"]))
 
+    bump_revision(conn, session["user_id"], "tasks")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
@@ -363,6 +465,11 @@ def api_get_notes():
         return jsonify({"content": ""})
 
     conn = get_db()
+
+    etag = resource_etag(conn, "notes")
+    if request.if_none_match.contains(etag):
+        return etag_response(app.response_class(status=304), etag)
+
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -374,12 +481,9 @@ def api_get_notes():
     """, (session["user_id"],))
 
     row = cursor.fetchone()
-    conn.close()
 
-    if row:
-        return jsonify({"content": row[0]})
-    else:
-        return jsonify({"content": ""})
+    content = row[0] if row else ""
+    return etag_response(jsonify({"content": content}), etag)
 
 @app.route("/api/notes/save", methods=["POST"])
 def api_save_notes():
@@ -408,35 +512,109 @@ def api_save_notes():
         datetime.now().isoformat()
     ))
 
+    bump_revision(conn, session["user_id"], "notes")
     conn.commit()
-    conn.close()
 
     return jsonify({"status": "ok"})
 
-@app.route("/api/chat", methods=["GET"])
-def api_get_chat():
-    conn = get_db()
-    cursor = conn.cursor()
+# ==============================
+# CHAT
+# ==============================
+CHAT_HISTORY_LIMIT = 100
+CHAT_STREAM_HEARTBEAT = 15
 
-    cursor.execute("""
-        SELECT username, message, created_at
-        FROM chat_messages
-        ORDER BY id DESC
-        LIMIT 100
-    """)
+# Bumped on every message so open streams wake up instead of polling
+_chat_condition = threading.Condition()
+_chat_version = 0
 
-    rows = cursor.fetchall()
-    conn.close()
+def fetch_chat_messages(conn, since_id=None):
+    cursor = conn.cursor()
+
+    if since_id is None:
+        cursor.execute("""
+            SELECT id, username, message, created_at
+            FROM chat_messages
+            ORDER BY id DESC
+            LIMIT ?
+        """, (CHAT_HISTORY_LIMIT,))
+    else:
+        cursor.execute("""
+            SELECT id, username, message, created_at
+            FROM chat_messages
+            WHERE id > ?
+            ORDER BY id ASC
+            LIMIT ?
+        """, (since_id, CHAT_HISTORY_LIMIT))
 
     messages = []
-    for r in rows:
+    for r in cursor.fetchall():
         messages.append({
-            "username": r[0],
-            "message": r[1],
-            "time": r[2]
+            "id": r[0],
+            "username": r[1],
+            "message": r[2],
+            "time": r[3]
         })
 
-    return jsonify(messages)
+    return messages
+
+def notify_chat():
+    global _chat_version
+    with _chat_condition:
+        _chat_version += 1
+        _chat_condition.notify_all()
+
+@app.route("/api/chat", methods=["GET"])
+def api_get_chat():
+    since_id = request.args.get("since_id", type=int)
+    return jsonify(fetch_chat_messages(get_db(), since_id))
+
+@app.route("/api/chat/stream", methods=["GET"])
+def api_chat_stream():
+    if "user_id" not in session:
+        return jsonify({"status": "error"}), 403
+
+    # EventSource sends Last-Event-ID by itself when it reconnects
+    since_id = request.headers.get("Last-Event-ID", type=int)
+    if since_id is None:
+        since_id = request.args.get("since_id", type=int)
+
+    def stream(last_id):
+        # The generator outlives the request context, so it owns its connection
+        conn = connect(DB_FILE)
+
+        try:
+            if last_id is None:
+                last_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM chat_messages").fetchone()[0]
+
+            while True:
+                seen_version = _chat_version
+
+                messages = fetch_chat_messages(conn, last_id)
+                for message in messages:
+                    last_id = message["id"]
+                    yield f"id: {last_id}\ndata: {json.dumps(message)}\n\n"
+
+                if len(messages) == CHAT_HISTORY_LIMIT:
+                    continue
+
+                with _chat_condition:
+                    woke = _chat_condition.wait_for(
+                        lambda: _chat_version != seen_version,
+                        timeout=CHAT_STREAM_HEARTBEAT
+                    )
+
+                # Comment line keeps proxies from closing an idle stream and
+                # the periodic re-check also picks up other worker processes
+                if not woke:
+                    yield ": keepalive\n\n"
+        finally:
+            conn.close()
+
+    return Response(
+        stream(since_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.route("/api/chat/send", methods=["POST"])
 def api_send_chat():
@@ -452,14 +630,8 @@ def api_send_chat():
     conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT username
-        FROM users
-        WHERE id = ?
-    """, (session["user_id"],))
-
-    user = cursor.fetchone()
-    username = user[0] if user else "unknown"
+    identity = get_user_identity(session["user_id"])
+    username = identity["username"] if identity else "unknown"
 
     cursor.execute("""
         INSERT INTO chat_messages (user_id, username, message, created_at)
@@ -472,37 +644,135 @@ def api_send_chat():
     ))
 
     conn.commit()
-    conn.close()
+    notify_chat()
 
     return jsonify({"status": "ok"})
 
+# ==============================
+# KANBAN
+# ==============================
+def apply_kanban_ops(conn, user_id, ops):
+    now = datetime.now().isoformat()
+    adds = []
+    moves = []
+    removes = []
+
+    if not isinstance(ops, list):
+        raise ValueError("Kanban ops must be a list")
+
+    for op in ops:
+        if not isinstance(op, dict):
+            raise ValueError(f"Kanban op must be an object: {op!r}")
+
+        link = op.get("link")
+        if not link:
+            continue
+
+        kind = op.get("op")
+        if kind == "add":
+            adds.append((user_id, op.get("title"), link, op.get("column"), now))
+            removes.append((user_id, link))
+        elif kind == "move":
+            moves.append((op.get("column"), user_id, link))
+        elif kind == "remove":
+            removes.append((user_id, link))
+        else:
+            raise ValueError(f"Unknown kanban op: {kind}")
+
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        DELETE FROM kanban_cards
+        WHERE user_id = ?
+        AND link = ?
+    """, removes)
+
+    cursor.executemany("""
+        UPDATE kanban_cards
+        SET column_name = ?
+        WHERE user_id = ?
+        AND link = ?
+    """, moves)
+
+    cursor.executemany("""
+        INSERT INTO kanban_cards (user_id, title, link, column_name, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, adds)
+
 @app.route("/api/kanban", methods=["GET"])
 def api_get_kanban():
     if "user_id" not in session:
         return jsonify({})
 
     conn = get_db()
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT title, link, column_name
-        FROM kanban_cards
-        WHERE user_id = ?
-    """, (session["user_id"],))
+    revision = get_revision(conn, session["user_id"], "kanban")
+    etag = revision_etag(session["user_id"], "kanban", revision)
 
-    rows = cursor.fetchall()
-    conn.close()
-
-    data = {}
-    for title, link, column in rows:
-        if column not in data:
-            data[column] = []
-        data[column].append({
-            "title": title,
-            "link": link
-        })
+    if request.if_none_match.contains(etag):
+        response = etag_response(app.response_class(status=304), etag)
+    else:
+        cursor = conn.cursor()
 
-    return jsonify(data)
+        cursor.execute("""
+            SELECT title, link, column_name
+            FROM kanban_cards
+            WHERE user_id = ?
+        """, (session["user_id"],))
+
+        rows = cursor.fetchall()
+
+        data = {}
+        for title, link, column in rows:
+            if column not in data:
+                data[column] = []
+            data[column].append({
+                "title": title,
+                "link": link
+            })
+
+        response = etag_response(jsonify(data), etag)
+
+    # The client sends this back with its next patch
+    response.headers["X-Kanban-Revision"] = str(revision)
+    return response
+
+@app.route("/api/kanban/patch", methods=["POST"])
+def api_patch_kanban():
+    if "user_id" not in session:
+        return jsonify({"status": "error"}), 403
+
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Expected a JSON object"}), 400
+
+    ops = data.get("ops") or []
+
+    conn = get_db()
+
+    # Take the write lock before reading the revision so two patches can't
+    # both be applied against the same board state
+    conn.execute("BEGIN IMMEDIATE")
+    revision = get_revision(conn, session["user_id"], "kanban")
+
+    if not ops:
+        conn.rollback()
+        return jsonify({"status": "ok", "revision": revision})
+
+    if data.get("revision") != revision:
+        conn.rollback()
+        return jsonify({"status": "conflict", "revision": revision}), 409
+
+    try:
+        apply_kanban_ops(conn, session["user_id"], ops)
+    except ValueError as e:
+        conn.rollback()
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    bump_revision(conn, session["user_id"], "kanban")
+    conn.commit()
+
+    return jsonify({"status": "ok", "revision": revision + 1})
 
 @app.route("/api/kanban/save", methods=["POST"])
 def api_save_kanban():
@@ -514,68 +784,152 @@ def api_save_kanban():
     conn = get_db()
     cursor = conn.cursor()
 
-    # Clear old board for this user
     cursor.execute("""
-        DELETE FROM kanban_cards
+        SELECT link, column_name
+        FROM kanban_cards
         WHERE user_id = ?
     """, (session["user_id"],))
 
-    # Insert all cards
+    saved = dict(cursor.fetchall())
+    posted = {}
+    ops = []
+
+    # Turn the full board into add/move/remove ops against what is stored
     for column, cards in data.items():
         for card in cards:
-            cursor.execute("""
-                INSERT INTO kanban_cards (user_id, title, link, column_name, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                session["user_id"],
-                card.get("title"),
-                card.get("link"),
-                column,
-                datetime.now().isoformat()
-            ))
+            link = card.get("link")
+            posted[link] = column
 
-    conn.commit()
-    conn.close()
+            if link not in saved:
+                ops.append({"op": "add", "link": link, "title": card.get("title"), "column": column})
+            elif saved[link] != column:
+                ops.append({"op": "move", "link": link, "column": column})
+
+    for link in saved:
+        if link not in posted:
+            ops.append({"op": "remove", "link": link})
+
+    if ops:
+        apply_kanban_ops(conn, session["user_id"], ops)
+        bump_revision(conn, session["user_id"], "kanban")
+        conn.commit()
 
     return jsonify({"status": "ok"})
 
 
 # ==============================
-# FETCH JOB DETAILS LIVE
+# FETCH JOB DETAILS (CACHED)
 # ==============================
+DETAILS_TTL = timedelta(days=7)
+
+# A page without a description is tried again much sooner
+EMPTY_DETAILS_TTL = timedelta(hours=1)
+DETAILS_TIMEOUT = 20
+DETAILS_MAX_LENGTH = 8000
+
+# Try common description containers
+DESCRIPTION_SELECTORS = [
+    "[data-testid='job-description']",
+    ".job-description",
+    "#job-description",
+    "article",
+    "main"
+]
+
+# Keep-alive connections shared by all workers of this process
+details_session = requests.Session()
+details_session.headers.update({"User-Agent": "Mozilla/5.0"})
+details_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+details_session.mount("http://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# url -> Future of the fetch that is currently running for it
+_details_inflight = {}
+_details_lock = threading.Lock()
+
+def fetch_description(url):
+    response = details_session.get(url, timeout=DETAILS_TIMEOUT)
+
+    # Error pages (403, 429, 5xx) must not be stored as the description
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, "html.parser")
+
+    text = ""
+    for sel in DESCRIPTION_SELECTORS:
+        el = soup.select_one(sel)
+        if el:
+            text = el.get_text(separator="\n", strip=True)
+            if len(text) > 200:
+                break
+
+    return text[:DETAILS_MAX_LENGTH]
+
+def fetch_description_once(url):
+    # Concurrent clicks on the same job wait for one shared fetch
+    with _details_lock:
+        future = _details_inflight.get(url)
+        owner = future is None
+        if owner:
+            future = Future()
+            _details_inflight[url] = future
+
+    if not owner:
+        return future.result(timeout=DETAILS_TIMEOUT * 2)
+
+    try:
+        text = fetch_description(url)
+        future.set_result(text)
+        return text
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _details_lock:
+            _details_inflight.pop(url, None)
+
 @app.route("/job-details")
 def job_details():
     url = request.args.get("url")
     if not url:
         return jsonify({"error": "No URL"}), 400
 
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=20)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Try common description containers
-        selectors = [
-            "[data-testid='job-description']",
-            ".job-description",
-            "#job-description",
-            "article",
-            "main"
-        ]
-
-        text = ""
-        for sel in selectors:
-            el = soup.select_one(sel)
-            if el:
-                text = el.get_text(separator="\n", strip=True)
-                if len(text) > 200:
-                    break
-
-        return jsonify({"description": text[:8000]})
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT description, description_fetched_at
+        FROM jobs
+        WHERE link = ?
+    """, (url,))
+    row = cursor.fetchone()
+
+    if row and row[1]:
+        ttl = DETAILS_TTL if row[0] else EMPTY_DETAILS_TTL
+        if datetime.now() - datetime.fromisoformat(row[1]) < ttl:
+            return jsonify({"description": row[0]})
 
+    try:
+        text = fetch_description_once(url)
     except Exception as e:
+        # An outdated description is still better than an error
+        if row and row[1]:
+            return jsonify({"description": row[0]})
         return jsonify({"error": str(e)}), 500
 
+    # An empty result keeps the description fetched before, if there is one
+    if not text and row and row[0]:
+        text = row[0]
+
+    cursor.execute("""
+        UPDATE jobs
+        SET description = ?, description_fetched_at = ?
+        WHERE link = ?
+    """, (text, datetime.now().isoformat(), url))
+
+    conn.commit()
+
+    return jsonify({"description": text})
+
 @app.route("/api/admin/users", methods=["GET"])
 @role_required("admin")
 def api_admin_get_users():
@@ -589,7 +943,6 @@ def api_admin_get_users():
     """)
 
     rows = cursor.fetchall()
-    conn.close()
 
     users = []
     for r in rows:
@@ -605,7 +958,7 @@ def api_admin_get_users():
 @role_required("admin")
 def api_admin_change_role():
     data = request.json
-    user_id = data.get("id")
+    user_id = parse_user_id(data.get("id"))
     new_role = data.get("role")
 
     if not user_id or not new_role:
@@ -621,7 +974,7 @@ def api_admin_change_role():
     """, (new_role, user_id))
 
     conn.commit()
-    conn.close()
+    forget_user_identity(user_id)
 
     return jsonify({"status": "ok"})
 
@@ -629,13 +982,13 @@ def api_admin_change_role():
 @role_required("admin")
 def api_admin_delete_user():
     data = request.json
-    user_id = data.get("id")
+    user_id = parse_user_id(data.get("id"))
 
     if not user_id:
         return jsonify({"status": "error"}), 400
 
     # Prevent deleting yourself
-    if int(user_id) == session["user_id"]:
+    if user_id == session["user_id"]:
         return jsonify({"status": "error", "message": "Cannot delete yourself"}), 400
 
     conn = get_db()
@@ -647,7 +1000,7 @@ def api_admin_delete_user():
     """, (user_id,))
 
     conn.commit()
-    conn.close()
+    forget_user_identity(user_id)
 
     return jsonify({"status": "ok"})
 
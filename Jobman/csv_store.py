@@ -0,0 +1,166 @@
+import csv
+import hashlib
+import os
+import sys
+from job_identity import normalize_url
+
+CSV_FILE = "jobs.csv"
+
+# Columns for a new file, an existing file keeps its own header
+FIELDNAMES = ["title", "company", "location", "description", "link", "source", "scraped_at"]
+
+# Bumped when row_key changes, older index files are rebuilt
+INDEX_VERSION = 2
+
+
+# ==============================
+# DEDUPE INDEX
+# ==============================
+def index_file(csv_file):
+    return csv_file + ".keys"
+
+
+def index_header(key_fields):
+    return f"# v{INDEX_VERSION} " + ",".join(key_fields)
+
+
+def row_key(row, key_fields):
+    values = []
+    for field in key_fields:
+        value = str(row.get(field) or "")
+
+        # Canonical, a link that only differs in tracking parameters is the same row
+        if field == "link":
+            value = normalize_url(value) or ""
+
+        values.append(value)
+
+    value = "\x1f".join(values)
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def read_header(csv_file):
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def build_index(csv_file, key_fields):
+    keys = set()
+
+    if os.path.exists(csv_file):
+        with open(csv_file, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                keys.add(row_key(row, key_fields))
+
+    write_index(csv_file, key_fields, keys)
+    return keys
+
+
+def write_index(csv_file, key_fields, keys):
+    with open(index_file(csv_file), "w", encoding="utf-8") as f:
+        f.write(index_header(key_fields) + "\n")
+        for key in keys:
+            f.write(key + "\n")
+
+
+def load_index(csv_file, key_fields):
+    path = index_file(csv_file)
+
+    if os.path.exists(path) and os.path.exists(csv_file):
+        with open(path, "r", encoding="utf-8") as f:
+            header = f.readline().strip()
+
+            # Same key as when the index was built, otherwise rebuild it
+            if header == index_header(key_fields):
+                return {line.strip() for line in f if line.strip()}
+
+    return build_index(csv_file, key_fields)
+
+
+# ==============================
+# APPEND
+# ==============================
+def append_jobs(jobs, key_fields, csv_file=CSV_FILE):
+    """
+    Appends the jobs whose key_fields were never saved before and returns
+    them. Only the new rows and their keys touch the disk.
+    """
+    keys = load_index(csv_file, key_fields)
+
+    new_jobs = []
+    new_keys = []
+    for job in jobs:
+        # Links are stored canonical
+        job = dict(job, link=normalize_url(job.get("link")) or "")
+        key = row_key(job, key_fields)
+        if key not in keys:
+            keys.add(key)
+            new_jobs.append(job)
+            new_keys.append(key)
+
+    if not new_jobs:
+        return new_jobs
+
+    exists = os.path.exists(csv_file) and os.path.getsize(csv_file) > 0
+    fieldnames = read_header(csv_file) if exists else FIELDNAMES
+
+    with open(csv_file, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="", extrasaction="ignore")
+        if not exists:
+            writer.writeheader()
+        writer.writerows(new_jobs)
+
+    # Keys go after the rows, a crash in between can only let a duplicate in, compact() removes it
+    with open(index_file(csv_file), "a", encoding="utf-8") as f:
+        for key in new_keys:
+            f.write(key + "\n")
+
+    return new_jobs
+
+
+# ==============================
+# COMPACTION
+# ==============================
+def compact(key_fields, csv_file=CSV_FILE):
+    """
+    Rewrites the file without duplicate rows and rebuilds the index.
+    Only needed for files that were written before the index existed.
+    """
+    if not os.path.exists(csv_file):
+        return 0, 0
+
+    keys = set()
+    kept = 0
+    dropped = 0
+    tmp_file = csv_file + ".tmp"
+
+    with open(csv_file, "r", encoding="utf-8", newline="") as src, \
+            open(tmp_file, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.DictReader(src)
+        writer = csv.DictWriter(dst, fieldnames=reader.fieldnames or FIELDNAMES)
+        writer.writeheader()
+
+        for row in reader:
+            key = row_key(row, key_fields)
+            if key in keys:
+                dropped += 1
+                continue
+
+            keys.add(key)
+            writer.writerow(row)
+            kept += 1
+
+    os.replace(tmp_file, csv_file)
+    write_index(csv_file, key_fields, keys)
+
+    return kept, dropped
+
+
+if __name__ == "__main__":
+    # python csv_store.py jobs.csv title,company,location,link,source
+    if len(sys.argv) != 3:
+        print("Usage: python csv_store.py <csv file> <comma separated key fields>")
+        sys.exit(1)
+
+    kept, dropped = compact(sys.argv[2].split(","), sys.argv[1])
+    print(f"Compacted {sys.argv[1]}: {kept} rows kept, {dropped} duplicates removed.")
@@ -1,43 +1,157 @@
-import sqlite3
-import pandas as pd
+import argparse
+import csv
+import glob
+import os
+import time
+from db import DB_FILE, connect, run_migrations
+from job_writer import INSERT_JOB_SQL, job_row
 
-DB_FILE = "jobs.db"
 CSV_FILE = "jobs.csv"
 
-conn = sqlite3.connect(DB_FILE)
-cursor = conn.cursor()
+# Rows per executemany call
+CHUNK_SIZE = 50000
 
-df = pd.read_csv(CSV_FILE)
+# Needed by the duplicate checks of every insert, never deferred
+KEEP_INDEXES = ("idx_jobs_canonical_link", "idx_jobs_content_hash")
 
-inserted = 0
-skipped = 0
+# Long descriptions are larger than the csv module allows by default
+csv.field_size_limit(16 * 1024 * 1024)
 
-for _, row in df.iterrows():
-    try:
+
+# ==============================
+# READING
+# ==============================
+def expand_files(patterns):
+    files = []
+
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        for path in matches:
+            if path not in files:
+                files.append(path)
+
+    return files
+
+
+def read_chunks(csv_file, chunk_size=CHUNK_SIZE):
+    # Streams the file, only one chunk of rows is in memory at a time
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        chunk = []
+
+        for row in csv.DictReader(f):
+            chunk.append(job_row({key: value or "" for key, value in row.items()}))
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+# ==============================
+# DEFERRED INDEXES
+# ==============================
+def drop_deferred(cursor):
+    """
+    Drops the secondary indexes and triggers on jobs and returns their SQL.
+    The indexes the duplicate checks use stay.
+    """
+    cursor.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = 'jobs' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)
+    deferred = [row for row in cursor.fetchall() if row[1] not in KEEP_INDEXES]
+
+    for kind, name, _ in deferred:
+        cursor.execute(f"DROP {kind.upper()} {name}")
+
+    return deferred
+
+
+def restore_deferred(cursor, deferred, first_new_id):
+    for _, _, sql in deferred:
+        cursor.execute(sql)
+
+    # The FTS triggers were off, index the imported rows in one statement
+    if any(name == "jobs_fts_insert" for _, name, _ in deferred):
         cursor.execute("""
-            INSERT OR IGNORE INTO jobs
-            (title, company, location, link, source, description, scraped_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            row.get("title", ""),
-            row.get("company", ""),
-            row.get("location", ""),
-            row.get("link", ""),
-            row.get("source", ""),
-            row.get("description", ""),
-            row.get("scraped_at", "")
-        ))
-
-        if cursor.rowcount == 1:
-            inserted += 1
-        else:
-            skipped += 1
-
-    except Exception as e:
-        print("Error inserting row:", e)
-
-conn.commit()
-conn.close()
-
-print(f"Inserted: {inserted}")
-print(f"Skipped duplicates: {skipped}")
+            INSERT INTO jobs_fts (rowid, title, company, location, description)
+            SELECT id, title, company, location, description
+            FROM jobs
+            WHERE id >= ?
+        """, (first_new_id,))
+
+
+# ==============================
+# IMPORT
+# ==============================
+def import_files(files, db_file=DB_FILE, chunk_size=CHUNK_SIZE):
+    conn = connect(db_file)
+
+    # The duplicate checks need the identity columns
+    run_migrations(conn)
+
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    totals = {"inserted": 0, "skipped": 0}
+
+    try:
+        # One write transaction for the whole import, nothing half-done stays behind
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM jobs")
+        first_new_id = cursor.fetchone()[0]
+
+        deferred = drop_deferred(cursor)
+
+        for csv_file in files:
+            if not os.path.exists(csv_file):
+                print(f"{csv_file} not found.")
+                continue
+
+            inserted = 0
+            skipped = 0
+
+            for chunk in read_chunks(csv_file, chunk_size):
+                before = conn.total_changes
+
+                cursor.executemany(INSERT_JOB_SQL, chunk)
+
+                # total_changes adds up changes() of every executed row
+                added = conn.total_changes - before
+                inserted += added
+                skipped += len(chunk) - added
+
+            print(f"{csv_file}: inserted {inserted}, skipped duplicates {skipped}")
+            totals["inserted"] += inserted
+            totals["skipped"] += skipped
+
+        restore_deferred(cursor, deferred, first_new_id)
+        cursor.execute("COMMIT")
+
+    except Exception:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+
+    finally:
+        conn.close()
+
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import scraped job CSV files into the jobs table.")
+    parser.add_argument("files", nargs="*", default=[CSV_FILE], help="CSV files or glob patterns")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per insert batch")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    totals = import_files(expand_files(args.files), args.db, args.chunk_size)
+
+    print(f"Inserted: {totals['inserted']}")
+    print(f"Skipped duplicates: {totals['skipped']}")
+    print(f"Took {time.monotonic() - start:.1f} s")
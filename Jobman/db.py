@@ -1,12 +1,41 @@
 import sqlite3
+from job_identity import content_hash, normalize_url
 
 DB_FILE = "jobs.db"
 
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 20000
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def connect(db_file=DB_FILE):
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT_MS / 1000)
+
+    # WAL lets the dashboard read while a scraper is writing
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+    return conn
+
 
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    conn = connect(DB_FILE)
+
+    try:
+        run_migrations(conn)
+    finally:
+        conn.close()
 
+
+# ==============================
+# MIGRATIONS
+# ==============================
+# Steps also run on databases that got parts of them before schema
+# versions existed, so every statement has to be repeatable
+def migrate_create_tables(cursor):
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS jobs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,10 +115,224 @@ def init_db():
         created_at TEXT
     )
     """)
-    
-    
-    conn.commit()
-    conn.close()
+
+
+def migrate_description_fetched_at(cursor):
+    # When /job-details last fetched the description from the job page
+    add_column_if_missing(cursor, "jobs", "description_fetched_at", "TEXT")
+
+
+def migrate_revisions(cursor):
+    # Per-user change counters, used as ETags by the dashboard API
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS revisions (
+        user_id INTEGER,
+        resource TEXT,
+        revision INTEGER,
+        PRIMARY KEY (user_id, resource)
+    )
+    """)
+
+
+def migrate_page_fingerprints(cursor):
+    # Hash of the links on each listing page the scrapers saw last time
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS page_fingerprints (
+        site TEXT,
+        keyword TEXT,
+        location TEXT,
+        page INTEGER,
+        fingerprint TEXT NOT NULL,
+        checked_at TEXT,
+        PRIMARY KEY (site, keyword, location, page)
+    )
+    """)
+
+
+def migrate_jobs_fts(cursor):
+    init_fts(cursor)
+
+
+def migrate_dashboard_indexes(cursor):
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at)
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks (user_id, created_at)
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_notes_user ON notes (user_id)
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_kanban_cards_user_link ON kanban_cards (user_id, link)
+    """)
+
+    # Keep the oldest of each favorite so the unique index can be built
+    cursor.execute("""
+    DELETE FROM favorites
+    WHERE id NOT IN (
+        SELECT MIN(id) FROM favorites GROUP BY user_id, job_link
+    )
+    """)
+
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_favorites_user_link ON favorites (user_id, job_link)
+    """)
+
+
+def migrate_job_identity(cursor):
+    # Scrapers dedupe on these instead of the raw link, see job_identity.py
+    add_column_if_missing(cursor, "jobs", "canonical_link", "TEXT")
+    add_column_if_missing(cursor, "jobs", "content_hash", "TEXT")
+
+    conn = cursor.connection
+    conn.create_function("normalize_url", 1, normalize_url, deterministic=True)
+    conn.create_function("content_hash", 3, content_hash, deterministic=True)
+
+    cursor.execute("""
+    UPDATE jobs
+    SET canonical_link = normalize_url(link),
+        content_hash = content_hash(title, company, location)
+    """)
+
+    # Rows that were only new because of tracking parameters, the first one stays
+    cursor.execute("""
+    DELETE FROM jobs
+    WHERE canonical_link IS NOT NULL
+    AND id NOT IN (
+        SELECT MIN(id) FROM jobs
+        WHERE canonical_link IS NOT NULL
+        GROUP BY canonical_link
+    )
+    """)
+
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_canonical_link ON jobs (canonical_link)
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs (content_hash)
+    """)
+
+
+def migrate_scraped_at_sort_index(cursor):
+    # The dashboard sorts and seeks on IFNULL(scraped_at, ''), rows without a
+    # date would otherwise drop out of the keyset paging
+    cursor.execute("DROP INDEX IF EXISTS idx_jobs_scraped_at")
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at_sort ON jobs (IFNULL(scraped_at, ''))
+    """)
+
+
+# The position in this list is the schema version, only ever append
+MIGRATIONS = [
+    migrate_create_tables,
+    migrate_description_fetched_at,
+    migrate_revisions,
+    migrate_page_fingerprints,
+    migrate_jobs_fts,
+    migrate_dashboard_indexes,
+    migrate_job_identity,
+    migrate_scraped_at_sort_index
+]
+
+
+def schema_version(cursor):
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def run_migrations(conn):
+    # Explicit transactions, DDL would otherwise commit on its own
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    for version, migration in enumerate(MIGRATIONS, 1):
+        if schema_version(cursor) >= version:
+            continue
+
+        cursor.execute("BEGIN IMMEDIATE")
+
+        try:
+            # Another process may have applied it while we waited for the lock
+            if schema_version(cursor) < version:
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
+            cursor.execute("COMMIT")
+
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    conn.isolation_level = ""
+
+
+def add_column_if_missing(cursor, table, column, definition):
+    cursor.execute(f"PRAGMA table_info({table})")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def init_fts(cursor):
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'jobs_fts'
+    """)
+    fts_exists = cursor.fetchone() is not None
+
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+        title,
+        company,
+        location,
+        description,
+        content='jobs',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """)
+
+    # Keep the index in sync with every write to jobs, including scraper inserts
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+    AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO jobs_fts (rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """)
+
+    if not fts_exists:
+        # Title matches count most, description least
+        cursor.execute("""
+            INSERT INTO jobs_fts (jobs_fts, rank)
+            VALUES ('rank', 'bm25(10.0, 3.0, 3.0, 1.0)')
+        """)
+
+        # Index rows that were scraped before the table existed
+        cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+from bs4 import BeautifulSoup
+from site_registry import SITES
+
+# One page.evaluate per listing page instead of a round trip per element.
+# Both extractors return [{title, company, location, href}, ...] for the
+# card and field selectors of a site spec, href is the raw attribute.
+
+FIELDS = ("title", "company", "location")
+
+# Selector null is the card itself, "" a field the card doesn't have
+EXTRACT_CARDS_JS = """(spec) => {
+    const text = el => (el ? el.innerText : "").trim();
+    const pick = (card, selector) => {
+        if (selector === null) return card;
+        return selector ? card.querySelector(selector) : null;
+    };
+
+    return Array.from(document.querySelectorAll(spec.card), card => {
+        const link = pick(card, spec.link);
+        return {
+            title: text(pick(card, spec.title)),
+            company: text(pick(card, spec.company)),
+            location: text(pick(card, spec.location)),
+            href: link ? link.getAttribute("href") || "" : ""
+        };
+    });
+}"""
+
+
+def card_selectors(site):
+    spec = SITES[site]
+    return {key: spec[key] for key in ("card", "link") + FIELDS}
+
+
+async def extract_cards(page, site):
+    return await page.evaluate(EXTRACT_CARDS_JS, card_selectors(site))
+
+
+# ==============================
+# STATIC HTML
+# ==============================
+def _select(card, selector):
+    if selector is None:
+        return card
+    if not selector:
+        return None
+    return card.select_one(selector)
+
+
+def extract_cards_html(html, site):
+    selectors = card_selectors(site)
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+
+    for card in soup.select(selectors["card"]):
+        fields = {}
+        for field in FIELDS:
+            el = _select(card, selectors[field])
+            fields[field] = el.get_text(" ", strip=True) if el else ""
+
+        link_el = _select(card, selectors["link"])
+        fields["href"] = link_el.get("href", "") if link_el else ""
+
+        cards.append(fields)
+
+    return cards
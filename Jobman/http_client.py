@@ -0,0 +1,82 @@
+import asyncio
+import time
+import httpx
+from extractors import extract_cards_html
+from site_registry import SITES, cards_to_jobs, listing_urls
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+
+# Connections kept open over all sources
+MAX_CONNECTIONS = 10
+
+# Minimum seconds between two requests to the same host
+HOST_INTERVAL = 2.0
+HOST_INTERVALS = {}
+
+# host -> lock and the earliest time the next request may start
+_host_locks = {}
+_host_next = {}
+
+
+def create_client():
+    # One pooled client for all sources, keep-alive and HTTP/2 where offered
+    return httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=30,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    )
+
+
+def reset_hosts():
+    # Locks belong to the event loop of the previous run
+    _host_locks.clear()
+    _host_next.clear()
+
+
+async def wait_for_host(host):
+    lock = _host_locks.setdefault(host, asyncio.Lock())
+
+    async with lock:
+        delay = _host_next.get(host, 0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _host_next[host] = time.monotonic() + HOST_INTERVALS.get(host, HOST_INTERVAL)
+
+
+async def fetch_page(client, url, params=None):
+    await wait_for_host(httpx.URL(url).host)
+    return await client.get(url, params=params)
+
+
+# ==============================
+# SITES
+# ==============================
+def http_sites():
+    # Sites whose listing is in the served HTML, the rest need the browser
+    return [site for site, spec in SITES.items() if spec.get("http")]
+
+
+async def scrape_site_http(client, site, keyword, location, max_pages=None):
+    """
+    Plain HTTP counterpart of playwright_multisite.scrape_site, yields the
+    jobs of every listing page of one source.
+    """
+    spec = SITES[site]
+
+    for number, url in listing_urls(site, keyword, location, max_pages):
+        print(f"[{site}] {keyword}/{location} page {number}")
+        response = await fetch_page(client, url)
+
+        # Parsing is CPU work, keep it off the event loop
+        cards = await asyncio.to_thread(extract_cards_html, response.text, site)
+        if not cards:
+            # Fixed page lists go on, an empty result page is the end
+            if "urls" in spec:
+                continue
+            break
+
+        yield cards_to_jobs(site, cards, location)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from extractors import extract_cards, extract_cards_html
+from http_client import wait_for_host
+from page_waits import goto_ready
+from site_registry import SITES
+
+MODES_FILE = "fetch_modes.json"
+
+HTTP_TIMEOUT = 30
+
+# Sources stuck on the browser try plain HTTP again after this long
+MODE_TTL = timedelta(days=7)
+
+http_session = requests.Session()
+http_session.headers.update({"User-Agent": "Mozilla/5.0"})
+http_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+http_session.mount("http://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# "site|keyword|location" -> {"mode": "http" | "browser", "checked_at": "..."}
+_modes = {}
+
+# site -> {"http": n, "browser": n, "fallback": n}
+_fetch_stats = {}
+
+
+# ==============================
+# MODES
+# ==============================
+def load_fetch_modes():
+    _modes.clear()
+
+    if not os.path.exists(MODES_FILE):
+        return
+
+    try:
+        with open(MODES_FILE, "r", encoding="utf-8") as f:
+            _modes.update(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"Could not read {MODES_FILE}: {e}")
+
+
+def save_fetch_modes():
+    with open(MODES_FILE, "w", encoding="utf-8") as f:
+        json.dump(_modes, f, indent=2, sort_keys=True)
+
+
+def source_key(site, keyword, location):
+    return f"{site}|{keyword}|{location}"
+
+
+def get_mode(site, key):
+    entry = _modes.get(key)
+
+    if entry:
+        checked_at = datetime.strptime(entry["checked_at"], "%Y-%m-%d %H:%M:%S")
+        if entry["mode"] == "http" or datetime.now() - checked_at < MODE_TTL:
+            return entry["mode"]
+
+    if SITES[site].get("http"):
+        return "http"
+    return "browser"
+
+
+def set_mode(key, mode):
+    _modes[key] = {
+        "mode": mode,
+        "checked_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+# ==============================
+# FETCHING
+# ==============================
+def fetch_cards_http(site, url):
+    response = http_session.get(url, timeout=HTTP_TIMEOUT)
+    if response.status_code != 200:
+        return []
+    return extract_cards_html(response.text, site)
+
+
+async def fetch_cards(page, site, url, key):
+    stats = _fetch_stats.setdefault(site, {"http": 0, "browser": 0, "fallback": 0})
+    mode = get_mode(site, key)
+
+    if mode == "http":
+        # Without the browser wait in between, pages of a host would go out back to back
+        await wait_for_host(urlsplit(url).hostname)
+
+        try:
+            # Request and parsing both run off the event loop
+            cards = await asyncio.to_thread(fetch_cards_http, site, url)
+        except requests.RequestException as e:
+            print(f"[{site}] HTTP fetch failed, using the browser: {e}")
+            cards = []
+
+        if cards:
+            stats["http"] += 1
+            set_mode(key, "http")
+            return cards
+
+        stats["fallback"] += 1
+
+    await goto_ready(page, site, url)
+    cards = await extract_cards(page, site)
+    stats["browser"] += 1
+
+    # Only a page the browser could fill proves that HTTP isn't enough,
+    # an empty page past the last result says nothing about the source
+    if cards and mode == "http":
+        set_mode(key, "browser")
+
+    return cards
+
+
+# ==============================
+# STATISTICS
+# ==============================
+def print_fetch_stats():
+    if not _fetch_stats:
+        return
+
+    print("\nFetched pages:")
+
+    for site, stats in sorted(_fetch_stats.items()):
+        print(f"[{site}] {stats['http']} via HTTP, {stats['browser']} via browser ({stats['fallback']} fallbacks)")
+
+
+def reset_fetch_stats():
+    _fetch_stats.clear()
@@ -0,0 +1,90 @@
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Click and campaign tracking, dropped on every host
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "referrer", "trk", "tracking"
+}
+
+# Hosts whose job URLs are identified by the path plus these parameters,
+# everything else in their query is search or session state. A link with
+# none of them keeps its query, it can't be told apart otherwise.
+KEEP_PARAMS = {
+    "ch.indeed.com": {"jk"},
+    "www.careerjet.ch": set(),
+    "www.jobs.ch": set(),
+    "www.jobscout24.ch": set()
+}
+
+# Redirect paths that point at the same job as the target path, so the
+# redirect can be resolved without a request as long as the job key stays
+REDIRECT_PATHS = {
+    ("ch.indeed.com", "/rc/clk"): "/viewjob"
+}
+
+
+def normalize_url(url):
+    """
+    Returns the canonical form of a job link: lowercased scheme and host,
+    no fragment, no tracking or session parameters, known click redirects
+    resolved. Links that aren't absolute URLs come back stripped.
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    host = parts.netloc.lower()
+    if host.endswith(":443") and parts.scheme.lower() == "https":
+        host = host[:-4]
+    elif host.endswith(":80") and parts.scheme.lower() == "http":
+        host = host[:-3]
+
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key.lower().startswith("utm_") or key.lower() in TRACKING_PARAMS:
+            continue
+        params.append((key, value))
+
+    keep = KEEP_PARAMS.get(host)
+    identifying = [(key, value) for key, value in params if keep and key in keep]
+    if keep is not None and (identifying or not keep):
+        params = identifying
+
+    path = parts.path
+    target = REDIRECT_PATHS.get((host, path))
+    if target and identifying:
+        path = target
+
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(sorted(params)), ""))
+
+
+def normalize_text(value):
+    value = unicodedata.normalize("NFKC", value or "")
+    return re.sub(r"\s+", " ", value).strip().casefold()
+
+
+def content_hash(title, company, location):
+    """
+    Stable hash of the posting itself, the same job found under another
+    link or on another site hashes the same.
+
+    None without a company: jobs.ch and jobscout24 cards carry no company
+    and the search location as location, so title alone would merge
+    unrelated postings.
+    """
+    title = normalize_text(title)
+    company = normalize_text(company)
+    location = normalize_text(location)
+
+    if not title or not company:
+        return None
+
+    value = "\x1f".join((title, company, location))
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from db import DB_FILE, connect
+from job_identity import content_hash, normalize_url
+
+# Flush after this many buffered jobs ...
+BATCH_SIZE = 100
+
+# ... or when the oldest buffered job is this many seconds old
+FLUSH_INTERVAL = 10
+
+# A job is new when its canonical link is unknown and, if it has one,
+# no stored job has the same content hash
+INSERT_JOB_SQL = """
+    INSERT OR IGNORE INTO jobs
+    (title, company, location, link, source, description, scraped_at, canonical_link, content_hash)
+    SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9
+    WHERE ?9 IS NULL OR NOT EXISTS (SELECT 1 FROM jobs WHERE content_hash = ?9)
+"""
+
+
+def job_row(job):
+    title = job.get("title", "")
+    company = job.get("company", "")
+    location = job.get("location", "")
+    link = job.get("link", "")
+
+    return (
+        title,
+        company,
+        location,
+        link,
+        job.get("source", ""),
+        job.get("description", ""),
+        job.get("scraped_at", ""),
+        normalize_url(link),
+        content_hash(title, company, location)
+    )
+
+
+class JobWriter:
+    """
+    Buffers scraped jobs and inserts them with executemany, one short
+    transaction per flush instead of a commit per row.
+
+    All database work runs on the writer's own thread, so a flush that
+    waits for the dashboard's write lock never blocks the event loop.
+    Use it as "async with", a timer then also flushes jobs that sit in
+    the buffer longer than flush_interval.
+    """
+
+    def __init__(self, db_file=DB_FILE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        # SQLite connections stay on the thread that opened them
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.conn = self.executor.submit(connect, db_file).result()
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.buffered_since = None
+        self.timer = None
+
+        # One flush at a time, the timer is only cancelled between flushes
+        self.flush_lock = asyncio.Lock()
+
+        # (site, keyword, location, page) -> fingerprint, saved with the next flush
+        self.fingerprints = {}
+
+        # source -> {"inserted": n, "ignored": n}
+        self.stats = {}
+
+    async def __aenter__(self):
+        self.timer = asyncio.create_task(self.flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self.flush_lock:
+            self.timer.cancel()
+        await self.close()
+
+    async def add(self, jobs):
+        if not jobs:
+            return
+
+        if not self.buffer:
+            self.buffered_since = time.monotonic()
+        self.buffer.extend(jobs)
+
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+
+    def add_fingerprint(self, key, fingerprint):
+        # Buffered like the jobs so a page is only marked as seen once its jobs are stored
+        self.fingerprints[key] = fingerprint
+
+    async def flush_periodically(self):
+        # Also flushes a source that stopped adding jobs, not only on the next add()
+        while True:
+            if self.buffered_since is None:
+                delay = self.flush_interval
+            else:
+                delay = self.buffered_since + self.flush_interval - time.monotonic()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Flush failed, retrying with the next batch: {e}")
+
+    async def flush(self):
+        async with self.flush_lock:
+            await self.flush_buffer()
+
+    async def flush_buffer(self):
+        if not self.buffer and not self.fingerprints:
+            return
+
+        jobs = self.buffer
+        fingerprints = self.fingerprints
+        self.buffer = []
+        self.buffered_since = None
+        self.fingerprints = {}
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            counts = await loop.run_in_executor(self.executor, self.write, jobs, fingerprints)
+        except Exception:
+            # Nothing was committed, keep everything for the next flush
+            self.buffer = jobs + self.buffer
+            self.buffered_since = time.monotonic()
+            self.fingerprints = {**fingerprints, **self.fingerprints}
+            raise
+
+        for source, (inserted, ignored) in counts.items():
+            stats = self.stats.setdefault(source, {"inserted": 0, "ignored": 0})
+            stats["inserted"] += inserted
+            stats["ignored"] += ignored
+
+    def write(self, jobs, fingerprints):
+        # Runs on the writer thread
+        by_source = {}
+        for job in jobs:
+            by_source.setdefault(job.get("source", ""), []).append(job_row(job))
+
+        counts = {}
+        cursor = self.conn.cursor()
+
+        with self.conn:
+            for source, rows in by_source.items():
+                cursor.executemany(INSERT_JOB_SQL, rows)
+
+                # rowcount sums the direct inserts only, FTS trigger rows don't count
+                counts[source] = (cursor.rowcount, len(rows) - cursor.rowcount)
+
+            checked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cursor.executemany("""
+                INSERT INTO page_fingerprints
+                (site, keyword, location, page, fingerprint, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (site, keyword, location, page)
+                DO UPDATE SET fingerprint = excluded.fingerprint, checked_at = excluded.checked_at
+            """, [key + (fingerprint, checked_at) for key, fingerprint in fingerprints.items()])
+
+        return counts
+
+    async def close(self):
+        try:
+            await self.flush()
+        finally:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.conn.close)
+            self.executor.shutdown()
+
+    def print_stats(self):
+        for source, stats in sorted(self.stats.items()):
+            print(f"[{source}] {stats['inserted']} new jobs saved, {stats['ignored']} already known")
@@ -0,0 +1,75 @@
+from db import DB_FILE, connect
+from job_identity import normalize_url
+
+# Consecutive pages without a single new link before a source stops paginating
+STALE_PAGE_LIMIT = 2
+
+# Every n-th run walks every source down to its last page, never the first one
+FULL_SWEEP_EVERY = 6
+
+# site -> {"pages": n, "stopped": n}
+_crawl_stats = {}
+
+
+def load_known_links(db_file=DB_FILE):
+    conn = connect(db_file)
+
+    try:
+        return {row[0] for row in conn.execute("SELECT canonical_link FROM jobs")}
+    finally:
+        conn.close()
+
+
+def mark_new_links(known_links, jobs):
+    # Adds the links right away so parallel sources don't count them twice
+    new_links = 0
+
+    for job in jobs:
+        # Canonical, a link that only differs in tracking parameters isn't new
+        link = normalize_url(job.get("link"))
+        if link and link not in known_links:
+            known_links.add(link)
+            new_links += 1
+
+    return new_links
+
+
+class StaleCounter:
+    """
+    Tracks the pages of one source and tells when to stop paginating.
+    """
+
+    def __init__(self, site, known_links, full_sweep=False, limit=STALE_PAGE_LIMIT):
+        self.known_links = known_links
+        self.full_sweep = full_sweep
+        self.limit = limit
+        self.stale_pages = 0
+        self.stats = _crawl_stats.setdefault(site, {"pages": 0, "stopped": 0})
+
+    def should_stop(self, jobs):
+        self.stats["pages"] += 1
+
+        if mark_new_links(self.known_links, jobs):
+            self.stale_pages = 0
+        else:
+            self.stale_pages += 1
+
+        if self.full_sweep or self.stale_pages < self.limit:
+            return False
+
+        self.stats["stopped"] += 1
+        return True
+
+
+def print_crawl_stats():
+    if not _crawl_stats:
+        return
+
+    print("\nCrawled pages:")
+
+    for site, stats in sorted(_crawl_stats.items()):
+        print(f"[{site}] {stats['pages']} pages, {stats['stopped']} sources stopped early")
+
+
+def reset_crawl_stats():
+    _crawl_stats.clear()
@@ -0,0 +1,56 @@
+import hashlib
+from db import DB_FILE, connect
+from job_identity import normalize_url
+
+# "site keyword/location" -> {"hits": n, "misses": n}
+_fingerprint_stats = {}
+
+
+def load_fingerprints(db_file=DB_FILE):
+    conn = connect(db_file)
+
+    try:
+        rows = conn.execute("""
+            SELECT site, keyword, location, page, fingerprint
+            FROM page_fingerprints
+        """).fetchall()
+    finally:
+        conn.close()
+
+    return {tuple(row[:4]): row[4] for row in rows}
+
+
+def fingerprint_jobs(jobs):
+    # Sorted, so a page whose cards only moved around still counts as unchanged
+    links = sorted(normalize_url(job.get("link")) or "" for job in jobs)
+    return hashlib.sha1("\n".join(links).encode("utf-8")).hexdigest()
+
+
+def check_page(fingerprints, key, jobs):
+    """
+    Returns (unchanged, fingerprint) for one listing page and counts the
+    hit or miss for its source.
+    """
+    fingerprint = fingerprint_jobs(jobs)
+    unchanged = fingerprints.get(key) == fingerprint
+
+    site, keyword, location, _ = key
+    stats = _fingerprint_stats.setdefault(f"{site} {keyword}/{location}", {"hits": 0, "misses": 0})
+    stats["hits" if unchanged else "misses"] += 1
+
+    return unchanged, fingerprint
+
+
+def print_fingerprint_stats():
+    if not _fingerprint_stats:
+        return
+
+    print("\nUnchanged listing pages:")
+
+    for source, stats in sorted(_fingerprint_stats.items()):
+        total = stats["hits"] + stats["misses"]
+        print(f"[{source}] {stats['hits']} of {total} pages unchanged ({stats['hits'] / total * 100:.0f}% hit rate)")
+
+
+def reset_fingerprint_stats():
+    _fingerprint_stats.clear()
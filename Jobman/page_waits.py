@@ -0,0 +1,116 @@
+import asyncio
+import time
+from site_registry import SITES
+
+WAIT_TIMEOUT_MS = 10000
+
+# Grace period for cards after the page looked empty, they may still be rendering
+EMPTY_RECHECK_MS = 1000
+
+# site -> outcome counts and waited milliseconds
+_wait_stats = {}
+
+
+# ==============================
+# WAITING
+# ==============================
+async def wait_until_ready(page, site, timeout=WAIT_TIMEOUT_MS):
+    spec = SITES.get(site, {})
+    waits = {}
+
+    # Ready once a card shows up, or the site shows its "no results" element.
+    # Without a known marker, a page that stopped loading without cards is empty
+    if spec.get("card"):
+        waits["ready"] = page.wait_for_selector(spec["card"], state="visible", timeout=timeout)
+        if spec.get("empty"):
+            waits["empty"] = page.wait_for_selector(spec["empty"], state="visible", timeout=timeout)
+        else:
+            waits["empty"] = page.wait_for_load_state("networkidle", timeout=timeout)
+    if not waits:
+        waits["idle"] = page.wait_for_load_state("networkidle", timeout=timeout)
+
+    tasks = {asyncio.ensure_future(wait): name for name, wait in waits.items()}
+    pending = set(tasks)
+
+    try:
+        # First condition that holds wins, a failed wait leaves the others running
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [tasks[task] for task in done if task.exception() is None]
+            if "ready" in succeeded:
+                return "ready"
+            if succeeded:
+                break
+        else:
+            return "timeout"
+
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # An empty result ends the pagination, so make sure the cards aren't just late
+    if succeeded[0] == "empty" and await cards_appear(page, spec["card"]):
+        return "ready"
+
+    return succeeded[0]
+
+
+async def cards_appear(page, selector, timeout=EMPTY_RECHECK_MS):
+    try:
+        await page.wait_for_selector(selector, state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def goto_ready(page, site, url, timeout=WAIT_TIMEOUT_MS):
+    await page.goto(url, wait_until="domcontentloaded")
+
+    start = time.monotonic()
+    outcome = await wait_until_ready(page, site, timeout)
+    record_wait(site, outcome, (time.monotonic() - start) * 1000)
+
+    return outcome
+
+
+# ==============================
+# STATISTICS
+# ==============================
+def record_wait(site, outcome, waited_ms):
+    stats = _wait_stats.setdefault(site, {
+        "pages": 0,
+        "ready": 0,
+        "empty": 0,
+        "idle": 0,
+        "timeout": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0
+    })
+
+    stats["pages"] += 1
+    stats[outcome] += 1
+    stats["total_ms"] += waited_ms
+    stats["max_ms"] = max(stats["max_ms"], waited_ms)
+
+
+def print_wait_stats():
+    if not _wait_stats:
+        return
+
+    print("\nPage wait statistics:")
+
+    for site, stats in sorted(_wait_stats.items()):
+        avg_ms = stats["total_ms"] / stats["pages"]
+        fixed_ms = SITES.get(site, {}).get("fixed_wait_ms", 0) * stats["pages"]
+        saved_s = (fixed_ms - stats["total_ms"]) / 1000
+
+        print(
+            f"[{site}] {stats['pages']} pages | avg {avg_ms:.0f} ms | max {stats['max_ms']:.0f} ms | "
+            f"ready {stats['ready']} / empty {stats['empty']} / idle {stats['idle']} / timeout {stats['timeout']} | "
+            f"saved {saved_s:.0f} s vs fixed sleeps"
+        )
+
+
+def reset_wait_stats():
+    _wait_stats.clear()
@@ -0,0 +1,105 @@
+import csv
+import os
+import shutil
+import sys
+import uuid
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+DATASET_DIR = "jobs_parquet"
+
+COLUMNS = ["title", "company", "location", "description", "link", "source", "scraped_at"]
+
+SCHEMA = pa.schema([(column, pa.string()) for column in COLUMNS] + [("scrape_date", pa.string())])
+
+# jobs_parquet/source=jobs.ch/scrape_date=2024-05-01/part-....parquet
+PARTITIONING = ds.partitioning(
+    pa.schema([("source", pa.string()), ("scrape_date", pa.string())]),
+    flavor="hive"
+)
+
+# Rows per batch when importing an existing CSV
+IMPORT_BATCH_SIZE = 50000
+
+
+def jobs_to_table(jobs):
+    columns = {}
+
+    for column in COLUMNS:
+        values = []
+        for job in jobs:
+            value = job.get(column)
+            values.append(None if value is None else str(value))
+        columns[column] = values
+
+    columns["scrape_date"] = [(job.get("scraped_at") or "")[:10] or None for job in jobs]
+
+    return pa.table(columns, schema=SCHEMA)
+
+
+def append_parquet(jobs, dataset_dir=DATASET_DIR):
+    """
+    Writes the jobs as new files into their source/date partitions,
+    existing files are never read or rewritten.
+    """
+    if not jobs:
+        return
+
+    ds.write_dataset(
+        jobs_to_table(jobs),
+        dataset_dir,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+
+def import_csv(csv_file, dataset_dir=DATASET_DIR):
+    imported = 0
+
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        batch = []
+
+        for row in csv.DictReader(f):
+            batch.append(row)
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                append_parquet(batch, dataset_dir)
+                imported += len(batch)
+                batch = []
+
+        append_parquet(batch, dataset_dir)
+        imported += len(batch)
+
+    return imported
+
+
+def save_parquet(new_jobs, csv_file, dataset_dir=DATASET_DIR):
+    """
+    Adds the rows append_jobs just wrote to csv_file. The first call
+    imports the whole CSV instead, the dataset starts with its history.
+    """
+    if os.path.isdir(dataset_dir) or not os.path.exists(csv_file):
+        append_parquet(new_jobs, dataset_dir)
+        return
+
+    # new_jobs are in the CSV already
+    tmp_dir = dataset_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    count = import_csv(csv_file, tmp_dir)
+
+    # Moved into place once complete, the dashboard reads the CSV until then
+    if os.path.isdir(tmp_dir):
+        os.replace(tmp_dir, dataset_dir)
+        print(f"Imported {count} rows from {csv_file} into {dataset_dir}.")
+
+
+if __name__ == "__main__":
+    # One-off copy of an existing jobs.csv into the dataset
+    if len(sys.argv) != 2:
+        print("Usage: python parquet_store.py <csv file>")
+        sys.exit(1)
+
+    count = import_csv(sys.argv[1])
+    print(f"Imported {count} rows into {DATASET_DIR}.")
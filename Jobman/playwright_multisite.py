@@ -1,35 +1,23 @@
-from playwright.sync_api import sync_playwright
+import asyncio
 import pandas as pd
 from datetime import datetime
 import time
 import os
-import sqlite3
+from functools import partial
+from db import init_db
+from job_writer import JobWriter
+from known_links import FULL_SWEEP_EVERY, StaleCounter, load_known_links, print_crawl_stats, reset_crawl_stats
+from scrape_engine import run_engine
+from http_client import reset_hosts
+from hybrid_fetch import fetch_cards, load_fetch_modes, print_fetch_stats, reset_fetch_stats, save_fetch_modes, source_key
+from page_fingerprints import check_page, load_fingerprints, print_fingerprint_stats, reset_fingerprint_stats
+from page_waits import print_wait_stats, reset_wait_stats
+from route_profiles import print_route_stats, reset_route_stats
+from site_registry import SITES, cards_to_jobs, listing_urls
 
 DB_FILE = "jobs.db"
 
 
-def save_jobs_to_db(jobs):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    for job in jobs:
-        cursor.execute("""
-            INSERT OR IGNORE INTO jobs
-            (title, company, location, link, source, description, scraped_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            job.get("title", ""),
-            job.get("company", ""),
-            job.get("location", ""),
-            job.get("link", ""),
-            job.get("source", ""),
-            job.get("description", ""),
-            job.get("scraped_at", "")
-        ))
-
-    conn.commit()
-    conn.close()
-
 SOURCE_FILE = "sources.txt"
 
 
@@ -40,7 +28,7 @@ def load_sources():
     sources = []
 
     if not os.path.exists(SOURCE_FILE):
-        print("sources.txt not found.")
+        print(f"{SOURCE_FILE} not found.")
         return sources
 
     print("\nLoading sources...")
@@ -66,187 +54,104 @@ def load_sources():
 
 
 # ==============================
-# JOBS.CH SCRAPER
+# SITE SCRAPER
 # ==============================
-def scrape_jobs_ch(page, keyword, location, max_pages=1):
-    jobs = []
-
-    for p in range(1, max_pages + 1):
-        url = f"https://www.jobs.ch/en/vacancies/?term={keyword}&location={location}&page={p}"
-        print(f"[jobs.ch] {keyword}/{location} page {p}")
-
-        page.goto(url)
-        page.wait_for_timeout(2000)
-
-        links = page.query_selector_all("a[data-cy='job-link']")
-        print(f"Found {len(links)} jobs")
-
-        if not links:
-            break
+async def scrape_site(page, site, keyword, location, max_pages=None):
+    """
+    Scrapes one source as described by its spec in site_registry.SITES and
+    yields (page number, jobs) for every listing page.
+    """
+    spec = SITES[site]
+    key = source_key(site, keyword, location)
+
+    for number, url in listing_urls(site, keyword, location, max_pages):
+        print(f"[{site}] {keyword}/{location} page {number}")
+
+        cards = await fetch_cards(page, site, url, key)
+        print(f"Found {len(cards)} jobs")
 
-        for link in links:
-            title = link.inner_text().strip()
-            href = link.get_attribute("href")
-            if not href:
+        if not cards:
+            # Fixed page lists go on, an empty result page is the end
+            if "urls" in spec:
                 continue
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": "https://www.jobs.ch" + href,
-                "source": "jobs.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-    return jobs
-
-
-# ==============================
-# JOBSCOUT24 SCRAPER
-# ==============================
-def scrape_jobscout24(page, keyword, location, max_pages=200):
-    jobs = []
-
-    for p in range(1, max_pages + 1):
-        url = f"https://www.jobscout24.ch/en/jobs?term={keyword}&location={location}&page={p}"
-        print(f"[jobscout24] {keyword}/{location} page {p}")
-
-        page.goto(url)
-        page.wait_for_timeout(2000)
-
-        links = page.query_selector_all("a[href*='/en/job/']")
-        print(f"Found {len(links)} jobs")
-
-        if not links:
             break
 
-        for link in links:
-            title = link.inner_text().strip()
-            href = link.get_attribute("href")
+        yield number, cards_to_jobs(site, cards, location)
 
-            if not href:
-                continue
-
-            if not href.startswith("http"):
-                href = "https://www.jobscout24.ch" + href
+        if spec.get("delay"):
+            await asyncio.sleep(spec["delay"])
 
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": href,
-                "source": "jobscout24.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-    return jobs
 
-
-# ==============================
-# INDEED SCRAPER
-# ==============================
-def scrape_indeed(page, keyword, location, max_pages=200):
+async def collect_source(max_pages, page, site, keyword, location):
     jobs = []
+    async for _, page_jobs in scrape_site(page, site, keyword, location, max_pages):
+        jobs.extend(page_jobs)
 
-    for p in range(max_pages):
-        start = p * 10
-        url = f"https://ch.indeed.com/jobs?q={keyword}&l={location}&start={start}"
-        print(f"[indeed] {keyword}/{location} page {p+1}")
+    print(f"[{site}] {keyword}/{location}: {len(jobs)} jobs")
+    return jobs
 
-        page.goto(url)
-        page.wait_for_timeout(3000)
 
-        cards = page.query_selector_all("div.job_seen_beacon")
-        print(f"Found {len(cards)} jobs")
+def collect_jobs(sources, max_pages=None):
+    """
+    Runs (site, keyword, location) sources on the shared engine and returns
+    all their jobs, for the scripts that write CSV instead of the database.
+    """
+    load_fetch_modes()
+    reset_hosts()
 
-        if not cards:
-            break
+    results = asyncio.run(run_engine(sources, partial(collect_source, max_pages)))
 
-        for card in cards:
-            title_el = card.query_selector("h2 a span")
-            company_el = card.query_selector("[data-testid='company-name']")
-            location_el = card.query_selector("[data-testid='text-location']")
-            link_el = card.query_selector("h2 a")
-
-            title = title_el.inner_text().strip() if title_el else ""
-            company = company_el.inner_text().strip() if company_el else ""
-            job_loc = location_el.inner_text().strip() if location_el else ""
-            href = link_el.get_attribute("href") if link_el else ""
-
-            if not title or not href:
-                continue
+    print_wait_stats()
+    reset_wait_stats()
+    print_route_stats()
+    reset_route_stats()
+    print_fetch_stats()
+    reset_fetch_stats()
+    save_fetch_modes()
 
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": job_loc,
-                "link": "https://ch.indeed.com" + href,
-                "source": "indeed.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+    return [job for jobs in results if jobs for job in jobs]
 
-    return jobs
 
 
 # ==============================
-# CAREERJET SCRAPER
+# MAIN SCRAPER
 # ==============================
-def scrape_careerjet(page, keyword, location, max_pages=1):
-    jobs = []
-
-    for p in range(1, max_pages + 1):
-        url = f"https://www.careerjet.ch/jobs?s={keyword}&l={location}&p={p}"
-        print(f"[careerjet] {keyword}/{location} page {p}")
-
-        page.goto(url)
-        page.wait_for_timeout(3000)
-
-        job_cards = page.query_selector_all("article.job")
-        print(f"Found {len(job_cards)} jobs")
-
-        if not job_cards:
+async def scrape_source(writer, known_links, fingerprints, full_sweep, page, site, keyword, location):
+    found = 0
+
+    # Only paginated searches stop early, every page of a fixed list is its own category
+    counter = None
+    if "urls" not in SITES[site]:
+        counter = StaleCounter(site, known_links, full_sweep)
+
+    # Scrapers yield one listing page at a time, the writer batches the inserts
+    async for page_number, jobs in scrape_site(page, site, keyword, location):
+        found += len(jobs)
+        key = (site, keyword, location, page_number)
+
+        # Same links as last time, everything on it is stored already.
+        # Such a page has no new links either, so it also counts as stale
+        unchanged, fingerprint = check_page(fingerprints, key, jobs)
+        if not unchanged:
+            writer.add_fingerprint(key, fingerprint)
+            await writer.add(jobs)
+
+        # Breaking out stops the scraper before it loads the next page
+        if counter and counter.should_stop(jobs):
+            print(f"[{site}] {keyword}/{location}: {counter.stale_pages} pages without new jobs, stopping")
             break
 
-        for card in job_cards:
-            title_el = card.query_selector("h2 a")
-            title = ""
-            link = ""
-
-            if title_el:
-                title = title_el.inner_text().strip()
-                href = title_el.get_attribute("href")
-                if href:
-                    if href.startswith("http"):
-                        link = href
-                    else:
-                        link = "https://www.careerjet.ch" + href
-
-            company_el = card.query_selector(".company")
-            company = company_el.inner_text().strip() if company_el else ""
-
-            location_el = card.query_selector(".location")
-            location_text = location_el.inner_text().strip() if location_el else ""
-
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": location_text,
-                "link": link,
-                "source": "careerjet.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        time.sleep(2)
+    return found
 
-    return jobs
 
+async def crawl(writer, sources, scrape):
+    # Leaving the with block flushes whatever is still buffered, also on errors
+    async with writer:
+        # All sources run in parallel browser contexts, capped per site
+        return await run_engine(sources, scrape)
 
 
-# ==============================
-# MAIN SCRAPER
-# ==============================
-def run_scraper():
+def run_scraper(full_sweep=False):
     print(f"\nBeep boop d maschine isch am dänke {datetime.now()}")
 
     sources = load_sources()
@@ -254,34 +159,42 @@ def run_scraper():
         print("No valid sources found.\n")
         return
 
-    all_jobs = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        for site, keyword, location in sources:
-            if site == "jobs.ch":
-                all_jobs.extend(scrape_jobs_ch(page, keyword, location))
-
-            elif site == "jobscout24.ch":
-                all_jobs.extend(scrape_jobscout24(page, keyword, location))
-
-            elif site == "careerjet.ch":
-                all_jobs.extend(scrape_careerjet(page, keyword, location))
-
-            elif site == "indeed.ch":
-                all_jobs.extend(scrape_indeed(page, keyword, location))
-
-            else:
-                print(f"Unknown site: {site}")
-
-        browser.close()
-
-    if all_jobs:
-        save_jobs_to_db(all_jobs)
-        print(f"{len(all_jobs)} jobs saved to database.")
-    
+    known_sources = []
+    for site, keyword, location in sources:
+        if site in SITES:
+            known_sources.append((site, keyword, location))
+        else:
+            print(f"Unknown site: {site}")
+
+    # The scraper may run before the web app ever created the tables
+    init_db()
+    load_fetch_modes()
+    reset_hosts()
+
+    # Pages that only repeat these links end the crawl of a source early
+    known_links = load_known_links(DB_FILE)
+    fingerprints = load_fingerprints(DB_FILE)
+    if full_sweep:
+        print("Full sweep, every source is crawled to its last page.")
+
+    writer = JobWriter(DB_FILE)
+    scrape = partial(scrape_source, writer, known_links, fingerprints, full_sweep)
+    results = asyncio.run(crawl(writer, known_sources, scrape))
+
+    print_wait_stats()
+    reset_wait_stats()
+    print_route_stats()
+    reset_route_stats()
+    print_fetch_stats()
+    reset_fetch_stats()
+    print_crawl_stats()
+    reset_crawl_stats()
+    print_fingerprint_stats()
+    reset_fingerprint_stats()
+    save_fetch_modes()
+
+    if sum(found or 0 for found in results):
+        writer.print_stats()
     else:
         print("No jobs found.")
 
@@ -291,7 +204,11 @@ def run_scraper():
 # LOOP EVERY 4 HOURS
 # ==============================
 if __name__ == "__main__":
+    # Starts at 1, a restart is an incremental run and not a full sweep
+    run_count = 1
+
     while True:
-        run_scraper()
+        run_scraper(full_sweep=run_count % FULL_SWEEP_EVERY == 0)
+        run_count += 1
         print("D maschine geit ga schlafe -4 h...\n")
         time.sleep(4 * 60 * 60)
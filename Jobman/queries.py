@@ -0,0 +1,149 @@
+import re
+import threading
+import time
+
+PAGE_SIZE = 100
+
+# Totals are reused until a scraper adds rows, or this many seconds pass
+COUNT_CACHE_TTL = 600
+COUNT_CACHE_SIZE = 256
+
+JOB_COLUMNS = "j.id, j.title, j.company, j.location, j.link, j.source, j.scraped_at"
+
+# Jobs without a date sort last and still get a cursor, NULL compares to nothing
+DATE_SORT_KEY = "IFNULL(j.scraped_at, '')"
+
+# (tables, where, params) -> (max id, counted at, total)
+_count_cache = {}
+_count_lock = threading.Lock()
+
+
+# ==============================
+# FILTERS
+# ==============================
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_fts_query(keyword):
+    # Every word must match, each as a prefix: "sach bern" -> "sach"* "bern"*
+    terms = re.findall(r"\w+", keyword)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def build_job_query(keyword="", location="", source=""):
+    clauses = []
+    params = []
+
+    fts_query = build_fts_query(keyword)
+    if fts_query:
+        tables = "jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid"
+        clauses.append("jobs_fts MATCH ?")
+        params.append(fts_query)
+        order = "jobs_fts.rank, j.id DESC"
+    else:
+        tables = "jobs j"
+        order = f"{DATE_SORT_KEY} DESC, j.id DESC"
+
+    for column, value in (("j.location", location), ("j.source", source)):
+        if value:
+            clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append("%" + escape_like(value) + "%")
+
+    where = ""
+    if clauses:
+        where = "WHERE " + " AND ".join(clauses)
+
+    return tables, where, params, order
+
+
+# ==============================
+# JOB QUERIES
+# ==============================
+def count_jobs(conn, keyword="", location="", source=""):
+    """
+    Counting visits every matching row, so totals are cached per filter.
+    A new MAX(id) means a scraper added rows and the total is counted again.
+    """
+    tables, where, params, _ = build_job_query(keyword, location, source)
+    key = (tables, where, tuple(params))
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT IFNULL(MAX(id), 0) FROM jobs")
+    max_id = cursor.fetchone()[0]
+    now = time.monotonic()
+
+    with _count_lock:
+        cached = _count_cache.get(key)
+
+    if cached and cached[0] == max_id and now - cached[1] < COUNT_CACHE_TTL:
+        return cached[2]
+
+    cursor.execute(f"SELECT COUNT(*) FROM {tables} {where}", params)
+    total = cursor.fetchone()[0]
+
+    with _count_lock:
+        if len(_count_cache) >= COUNT_CACHE_SIZE:
+            _count_cache.clear()
+        _count_cache[key] = (max_id, now, total)
+
+    return total
+
+
+def parse_cursor(cursor):
+    # Cursors are "<sort key>|<id>" of the last row on the previous page
+    key, sep, job_id = cursor.rpartition("|")
+    if not sep:
+        raise ValueError("Invalid cursor")
+    return key, int(job_id)
+
+
+def fetch_jobs_page(conn, keyword="", location="", source="", cursor=None, limit=PAGE_SIZE):
+    tables, where, params, order = build_job_query(keyword, location, source)
+    ranked = tables.startswith("jobs_fts")
+
+    if ranked:
+        sort_column = "jobs_fts.rank"
+    else:
+        sort_column = DATE_SORT_KEY
+
+    if cursor:
+        key, last_id = parse_cursor(cursor)
+
+        # Seek past the previous page instead of counting rows with OFFSET
+        if ranked:
+            key = float(key)
+            seek = "(jobs_fts.rank > ? OR (jobs_fts.rank = ? AND j.id < ?))"
+            params = params + [key, key, last_id]
+        else:
+            seek = f"({DATE_SORT_KEY}, j.id) < (?, ?)"
+            params = params + [key, last_id]
+
+        if where:
+            where += " AND " + seek
+        else:
+            where = "WHERE " + seek
+
+    db_cursor = conn.cursor()
+    db_cursor.execute(f"""
+        SELECT {JOB_COLUMNS}, {sort_column} AS sort_key
+        FROM {tables}
+        {where}
+        ORDER BY {order}
+        LIMIT ?
+    """, params + [limit + 1])
+
+    columns = [c[0] for c in db_cursor.description]
+    rows = [dict(zip(columns, row)) for row in db_cursor.fetchall()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        key = repr(last["sort_key"]) if ranked else last["sort_key"]
+        next_cursor = f"{key}|{last['id']}"
+
+    for row in rows:
+        del row["sort_key"]
+
+    return rows, next_cursor
@@ -0,0 +1,135 @@
+from urllib.parse import urlparse
+
+# The scrapers only read anchors and text, none of this is needed
+BLOCKED_RESOURCE_TYPES = ["image", "font", "media"]
+
+# Ads, analytics and consent managers, blocked on every site
+TRACKER_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "criteo.net",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+    "bat.bing.com",
+    "linkedin.com",
+    "tiktok.com",
+    "onetrust.com",
+    "cookielaw.org",
+    "usercentrics.eu",
+    "nr-data.net",
+    "sentry.io"
+]
+
+# first_party:       hosts the site serves its own pages and bundles from
+# block_third_party: abort every request that is not first party
+# allow:             hosts that are always let through, overrides all blocking
+ROUTE_PROFILES = {
+    "jobs.ch": {
+        "first_party": ["jobs.ch", "jobcloud.ch"],
+        "block_types": BLOCKED_RESOURCE_TYPES,
+        "block_third_party": True,
+        "allow": []
+    },
+    "jobscout24.ch": {
+        "first_party": ["jobscout24.ch", "jobcloud.ch"],
+        "block_types": BLOCKED_RESOURCE_TYPES,
+        "block_third_party": True,
+        "allow": []
+    },
+    "indeed.ch": {
+        # Result cards are rendered by JS and the bot check loads from third parties
+        "first_party": ["indeed.com", "indeed.ch"],
+        "block_types": BLOCKED_RESOURCE_TYPES,
+        "block_third_party": False,
+        "allow": ["challenges.cloudflare.com"]
+    },
+    "careerjet.ch": {
+        "first_party": ["careerjet.ch"],
+        "block_types": BLOCKED_RESOURCE_TYPES + ["stylesheet"],
+        "block_third_party": True,
+        "allow": []
+    }
+}
+
+DEFAULT_PROFILE = {
+    "first_party": [],
+    "block_types": BLOCKED_RESOURCE_TYPES,
+    "block_third_party": False,
+    "allow": []
+}
+
+# site -> {"allowed": n, "blocked": n}
+_route_stats = {}
+
+
+# ==============================
+# MATCHING
+# ==============================
+def host_matches(host, domains):
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return True
+    return False
+
+
+def should_block(profile, resource_type, url):
+    host = urlparse(url).hostname or ""
+
+    if host_matches(host, profile["allow"]):
+        return False
+
+    if resource_type in profile["block_types"]:
+        return True
+
+    if host_matches(host, TRACKER_HOSTS):
+        return True
+
+    if profile["block_third_party"] and not host_matches(host, profile["first_party"]):
+        return True
+
+    return False
+
+
+# ==============================
+# ROUTING
+# ==============================
+async def apply_route_profile(page, site):
+    profile = ROUTE_PROFILES.get(site, DEFAULT_PROFILE)
+    stats = _route_stats.setdefault(site, {"allowed": 0, "blocked": 0})
+
+    async def handle(route):
+        request = route.request
+
+        if should_block(profile, request.resource_type, request.url):
+            stats["blocked"] += 1
+            await route.abort()
+        else:
+            stats["allowed"] += 1
+            await route.continue_()
+
+    await page.route("**/*", handle)
+
+
+def print_route_stats():
+    if not _route_stats:
+        return
+
+    print("\nBlocked requests:")
+
+    for site, stats in sorted(_route_stats.items()):
+        total = stats["allowed"] + stats["blocked"]
+        share = stats["blocked"] / total * 100 if total else 0
+        print(f"[{site}] {stats['blocked']} of {total} requests blocked ({share:.0f}%)")
+
+
+def reset_route_stats():
+    _route_stats.clear()
@@ -0,0 +1,69 @@
+import asyncio
+from playwright.async_api import async_playwright
+from route_profiles import apply_route_profile
+
+# Browser contexts running at the same time
+CONCURRENCY = 6
+
+# Sources of the same site that may run at the same time
+DOMAIN_CONCURRENCY = 2
+
+# Overrides for single sites, e.g. {"indeed.ch": 1}
+DOMAIN_LIMITS = {}
+
+
+# ==============================
+# ENGINE
+# ==============================
+async def run_engine(sources, scrape, concurrency=CONCURRENCY, domain_concurrency=DOMAIN_CONCURRENCY):
+    """
+    Runs scrape(page, site, keyword, location) for every source on a pool
+    of browser contexts. Returns the results in the order of sources,
+    None for sources that failed.
+    """
+    domain_limits = {}
+    for site, _, _ in sources:
+        if site not in domain_limits:
+            limit = DOMAIN_LIMITS.get(site, domain_concurrency)
+            domain_limits[site] = asyncio.Semaphore(limit)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        contexts = asyncio.Queue()
+        for _ in range(concurrency):
+            contexts.put_nowait(await browser.new_context())
+
+        async def run_source(site, keyword, location):
+            # Wait for the site slot first so no context sits idle meanwhile
+            async with domain_limits[site]:
+                context = await contexts.get()
+                page = None
+
+                try:
+                    page = await context.new_page()
+
+                    # Drop images, fonts, trackers etc. per the site's profile
+                    await apply_route_profile(page, site)
+
+                    return await scrape(page, site, keyword, location)
+
+                except Exception as e:
+                    print(f"[{site}] {keyword}/{location} failed: {e}")
+                    return None
+
+                finally:
+                    if page:
+                        await page.close()
+                    contexts.put_nowait(context)
+
+        results = await asyncio.gather(
+            *(run_source(site, keyword, location) for site, keyword, location in sources)
+        )
+
+        while not contexts.empty():
+            await contexts.get_nowait().close()
+
+        await browser.close()
+
+    return results
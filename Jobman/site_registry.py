@@ -0,0 +1,212 @@
+from datetime import datetime
+from urllib.parse import quote_plus
+
+# One spec per site, the key is the site name used in sources.txt and jobs.source
+#
+# url:      listing page, {keyword}, {location} and {page} are filled in
+# urls:     fixed listing pages instead of url + pages, keyword/location unused
+# pages:    page numbers for {page}: first, step between pages, max pages
+# card:     selector of one job card, also what the page waits for
+# title, company, location, link:
+#           selectors inside the card, None for the card itself,
+#           "" when the card doesn't have it and defaults applies
+# defaults: field values for cards without them, "{location}" is the query location
+# require:  fields a card needs, cards without them are skipped
+# base_url: prefix for relative links
+# empty:    selector of the site's own "no results" element, None when there
+#           is none known: then a page that loads without cards is empty
+# http:     listing is in the served HTML, try plain HTTP before the browser
+# delay:    seconds to pause after each page
+# fixed_wait_ms: the sleep the scrapers used before, for the wait statistics
+SITES = {
+    "jobs.ch": {
+        "url": "https://www.jobs.ch/en/vacancies/?term={keyword}&location={location}&page={page}",
+        "pages": {"first": 1, "step": 1, "max": 1},
+        "card": "a[data-cy='job-link']",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {"location": "{location}"},
+        "require": ["link"],
+        "base_url": "https://www.jobs.ch",
+        "empty": None,
+        "http": True,
+        "fixed_wait_ms": 2000
+    },
+    "jobscout24.ch": {
+        "url": "https://www.jobscout24.ch/en/jobs?term={keyword}&location={location}&page={page}",
+        "pages": {"first": 1, "step": 1, "max": 200},
+        "card": "a[href*='/en/job/']",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {"location": "{location}"},
+        "require": ["link"],
+        "base_url": "https://www.jobscout24.ch",
+        "empty": None,
+        "http": True,
+        "fixed_wait_ms": 2000
+    },
+    "indeed.ch": {
+        "url": "https://ch.indeed.com/jobs?q={keyword}&l={location}&start={page}",
+        "pages": {"first": 0, "step": 10, "max": 200},
+        "card": "div.job_seen_beacon",
+        "title": "h2 a span",
+        "company": "[data-testid='company-name']",
+        "location": "[data-testid='text-location']",
+        "link": "h2 a",
+        "defaults": {},
+        "require": ["title", "link"],
+        "base_url": "https://ch.indeed.com",
+        "empty": ".jobsearch-NoResult-messageContainer",
+        "http": False,
+        "fixed_wait_ms": 3000
+    },
+    "careerjet.ch": {
+        "url": "https://www.careerjet.ch/jobs?s={keyword}&l={location}&p={page}",
+        "pages": {"first": 1, "step": 1, "max": 1},
+        "card": "article.job",
+        "title": "h2 a",
+        "company": ".company",
+        "location": ".location",
+        "link": "h2 a",
+        "defaults": {},
+        "require": ["link"],
+        "base_url": "https://www.careerjet.ch",
+        "empty": None,
+        "http": True,
+        "delay": 2,
+        "fixed_wait_ms": 3000
+    },
+    "jobagent.ch": {
+        # keyword is the category slug, e.g. informatik
+        "url": "https://www.jobagent.ch/{keyword}-jobs?page={page}",
+        "pages": {"first": 1, "step": 1, "max": 5},
+        "card": "a[href*='/job/']",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {},
+        "require": ["link"],
+        "base_url": "https://www.jobagent.ch",
+        "empty": None,
+        "http": True,
+        "fixed_wait_ms": 4000
+    },
+    "be.ch": {
+        "urls": [
+            "https://www.jobs.sites.be.ch/de/start/jobs/jobs-fuer-berufserfahrene-berufseinsteigende-und-studierende.html",
+            "https://www.jobs.sites.be.ch/de/start/jobs/lehrstellen-und-praktika-fuer-schuelerinnen-und-schueler.html",
+            "https://www.jobs.sites.be.ch/de/start/jobs/jobs-fuer-lehrpersonen.html"
+        ],
+        "card": "a[href*='job' i]",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {"company": "Kanton Bern", "location": "Bern"},
+        "require": ["title", "link"],
+        "base_url": "https://www.jobs.sites.be.ch",
+        "empty": None,
+        "http": True,
+        "fixed_wait_ms": 4000
+    },
+    "steze.be.ch": {
+        "urls": ["https://www.steze.apps.be.ch/steze/results"],
+        "card": "a[href*='job' i]",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {"company": "Kanton Bern", "location": "Bern"},
+        "require": ["title", "link"],
+        "base_url": "https://www.steze.apps.be.ch",
+        "empty": None,
+        "http": False,
+        "fixed_wait_ms": 5000
+    },
+    "ictjobs.ch": {
+        "url": "https://ictjobs.ch/?fs={keyword}",
+        "pages": {"first": 1, "step": 1, "max": 1},
+        "card": "a[href*='/job/']",
+        "title": None,
+        "company": "",
+        "location": "",
+        "link": None,
+        "defaults": {},
+        "require": ["link"],
+        "base_url": "https://ictjobs.ch",
+        "empty": None,
+        "http": False,
+        "fixed_wait_ms": 5000
+    }
+}
+
+
+# ==============================
+# PAGES
+# ==============================
+def listing_urls(site, keyword, location, max_pages=None):
+    """
+    Yields (page number, url) for every listing page of a source.
+    """
+    spec = SITES[site]
+
+    if "urls" in spec:
+        for number, url in enumerate(spec["urls"], 1):
+            yield number, url
+        return
+
+    pages = spec["pages"]
+    count = max_pages or pages["max"]
+
+    # Search pages without paging parameter have exactly one page
+    if "{page}" not in spec["url"]:
+        count = 1
+
+    for number in range(1, count + 1):
+        url = spec["url"].format(
+            keyword=quote_plus(keyword),
+            location=quote_plus(location),
+            page=pages["first"] + (number - 1) * pages["step"]
+        )
+        yield number, url
+
+
+# ==============================
+# JOBS
+# ==============================
+def build_link(spec, href):
+    if not href or href.startswith("http"):
+        return href
+    return spec["base_url"] + href
+
+
+def cards_to_jobs(site, cards, location):
+    spec = SITES[site]
+    scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    jobs = []
+
+    for card in cards:
+        job = {
+            "title": card["title"],
+            "company": card["company"],
+            "location": card["location"],
+            "link": build_link(spec, card["href"])
+        }
+
+        for field, value in spec["defaults"].items():
+            if not job[field]:
+                job[field] = value.replace("{location}", location)
+
+        if not all(job[field] for field in spec["require"]):
+            continue
+
+        job["source"] = site
+        job["scraped_at"] = scraped_at
+        jobs.append(job)
+
+    return jobs
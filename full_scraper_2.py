@@ -1,178 +1,69 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import asyncio
+import httpx
 import time
 from datetime import datetime
 import os
+import sys
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0"
-}
+# Shared with the Jobman scrapers, one copy of each module lives there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Jobman"))
 
-CSV_FILE = "jobs.csv"
-
-
-# ==============================
-# JOBS.CH SCRAPER
-# ==============================
-def scrape_jobs_ch(keyword, location, max_pages=50):
-    base_url = "https://www.jobs.ch/en/vacancies/"
-    jobs = []
-
-    for page in range(1, max_pages + 1):
-        params = {
-            "term": keyword,
-            "location": location,
-            "page": page
-        }
-
-        print(f"[jobs.ch] Page {page}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        cards = soup.select("a[data-cy='job-link']")
-        if not cards:
-            break
-
-        for card in cards:
-            title = card.get_text(strip=True)
-            link = "https://www.jobs.ch" + card.get("href", "")
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobs.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+from csv_store import append_jobs
+from parquet_store import save_parquet
+from http_client import create_client, reset_hosts, scrape_site_http
 
-        time.sleep(2)
+CSV_FILE = "jobs.csv"
 
-    return jobs
+DEDUPE_FIELDS = ["link"]
 
 
 # ==============================
-# INDEED CH SCRAPER
+# CSV STORAGE
 # ==============================
-def scrape_indeed(keyword, location, max_pages=50):
-    base_url = "https://ch.indeed.com/"
-    jobs = []
-
-    for page in range(max_pages):
-        start = page * 10
-
-        params = {
-            "q": keyword,
-            "l": location,
-            "start": start
-        }
-
-        print(f"[indeed] Page {page + 1}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        cards = soup.select("a.tapItem")
-        if not cards:
-            break
-
-        for card in cards:
-            title_el = card.select_one("h2 span")
-            company_el = card.select_one(".companyName")
-            location_el = card.select_one(".companyLocation")
-
-            title = title_el.get_text(strip=True) if title_el else ""
-            company = company_el.get_text(strip=True) if company_el else ""
-            job_loc = location_el.get_text(strip=True) if location_el else ""
-
-            link = "https://ch.indeed.com" + card.get("href", "")
-
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": job_loc,
-                "link": link,
-                "source": "indeed.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        time.sleep(2)
-
-    return jobs
+def save_to_csv(jobs):
+    new_jobs = append_jobs(jobs, DEDUPE_FIELDS, CSV_FILE)
+    save_parquet(new_jobs, CSV_FILE)
+    print(f"CSV updated. {len(new_jobs)} new entries.")
 
 
 # ==============================
-# JOBSCOUT24 SCRAPER
+# MAIN SCRAPER
 # ==============================
-def scrape_jobscout24(keyword, location, max_pages=50):
-    base_url = "https://www.jobscout24.ch/en/jobs"
-    jobs = []
-
-    for page in range(1, max_pages + 1):
-        params = {
-            "term": keyword,
-            "location": location,
-            "page": page
-        }
-
-        print(f"[jobscout24] Page {page}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        cards = soup.select("a[href*='/en/job/']")
-        if not cards:
-            break
-
-        for card in cards:
-            title = card.get_text(strip=True)
-            link = card.get("href")
+# Sites from site_registry.SITES, indeed needs the browser and runs in playwright_multisite.py
+SITES_TO_CRAWL = ["jobs.ch", "jobscout24.ch"]
 
-            if link and not link.startswith("http"):
-                link = "https://www.jobscout24.ch" + link
 
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobscout24.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+async def collect(client, site, keyword, location):
+    jobs = []
 
-        time.sleep(2)
+    try:
+        async for page_jobs in scrape_site_http(client, site, keyword, location):
+            jobs.extend(page_jobs)
+    except httpx.HTTPError as e:
+        print(f"[{site}] failed: {e}")
 
     return jobs
 
 
-# ==============================
-# CSV STORAGE
-# ==============================
-def save_to_csv(jobs):
-    new_df = pd.DataFrame(jobs)
+async def crawl(keyword, location):
+    reset_hosts()
 
-    if os.path.exists(CSV_FILE):
-        existing_df = pd.read_csv(CSV_FILE)
-        combined = pd.concat([existing_df, new_df], ignore_index=True)
-        combined.drop_duplicates(subset="link", inplace=True)
-        combined.to_csv(CSV_FILE, index=False)
-    else:
-        new_df.to_csv(CSV_FILE, index=False)
+    async with create_client() as client:
+        # All sites run side by side, the host limits keep every site at its pace
+        results = await asyncio.gather(
+            *(collect(client, site, keyword, location) for site in SITES_TO_CRAWL)
+        )
+
+    return [job for jobs in results for job in jobs]
 
 
-# ==============================
-# MAIN SCRAPER
-# ==============================
 def run_scraper():
     print(f"\nBeep boop d maschine isch am dänke {datetime.now()}")
 
     keyword = "ICT"
     location = "Bern"
 
-    all_jobs = []
-
-    all_jobs.extend(scrape_jobs_ch(keyword, location))
-    all_jobs.extend(scrape_indeed(keyword, location))
-    all_jobs.extend(scrape_jobscout24(keyword, location))
+    all_jobs = asyncio.run(crawl(keyword, location))
 
     if all_jobs:
         save_to_csv(all_jobs)
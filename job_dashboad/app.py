@@ -1,25 +1,87 @@
 from flask import Flask, render_template, request
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
 import os
 
 app = Flask(__name__)
 
 CSV_FILE = "jobs.csv"
 
+# Written by the scrapers, see parquet_store.py
+DATASET_DIR = "jobs_parquet"
 
-def load_jobs():
-    if not os.path.exists(CSV_FILE):
-        return pd.DataFrame(columns=["title", "company", "location", "link", "source", "scraped_at"])
-    return pd.read_csv(CSV_FILE)
+# Everything the job table shows, description is never loaded
+COLUMNS = ["title", "company", "location", "link", "source", "scraped_at"]
 
+# Rows per dashboard page
+PAGE_SIZE = 100
 
-@app.route("/")
-def index():
-    df = load_jobs()
+# Parquet files are memory-mapped instead of read into private buffers
+local_fs = fs.LocalFileSystem(use_mmap=True)
 
-    keyword = request.args.get("keyword", "").lower()
-    location = request.args.get("location", "").lower()
-    source = request.args.get("source", "").lower()
+
+def contains(column, value):
+    return pc.match_substring(pc.field(column), value, ignore_case=True)
+
+
+def load_jobs(keyword="", location="", source="", page=1):
+    """
+    Returns one page of the newest matching jobs and whether older ones exist.
+    """
+    if not os.path.isdir(DATASET_DIR):
+        return load_jobs_csv(keyword, location, source, page)
+
+    dataset = ds.dataset(DATASET_DIR, format="parquet", partitioning="hive", filesystem=local_fs)
+
+    # source is a partition column, so its filter skips whole directories
+    conditions = []
+    if keyword:
+        conditions.append(contains("title", keyword))
+    if location:
+        conditions.append(contains("location", location))
+    if source:
+        conditions.append(contains("source", source))
+
+    condition = None
+    for expression in conditions:
+        condition = expression if condition is None else condition & expression
+
+    # Only the partition paths are listed here, no file is opened
+    dates = set()
+    for fragment in dataset.get_fragments(filter=condition):
+        dates.add(ds.get_partition_keys(fragment.partition_expression).get("scrape_date"))
+
+    # Newest days first, once a page's worth of rows is found the older days can't be on it
+    needed = page * PAGE_SIZE + 1
+    tables = []
+    found = 0
+
+    for date in sorted(dates, key=lambda date: date or "", reverse=True):
+        day = pc.field("scrape_date") == date if date else pc.field("scrape_date").is_null()
+        table = dataset.to_table(columns=COLUMNS, filter=day if condition is None else condition & day)
+
+        tables.append(table)
+        found += table.num_rows
+        if found >= needed:
+            break
+
+    if not tables:
+        return [], False
+
+    table = pa.concat_tables(tables).sort_by([("scraped_at", "descending")])
+    jobs = table.slice((page - 1) * PAGE_SIZE, PAGE_SIZE + 1).to_pylist()
+
+    return jobs[:PAGE_SIZE], len(jobs) > PAGE_SIZE
+
+
+def load_jobs_csv(keyword="", location="", source="", page=1):
+    if not os.path.exists(CSV_FILE):
+        return [], False
+
+    df = pd.read_csv(CSV_FILE)
 
     if keyword:
         df = df[df["title"].str.lower().str.contains(keyword, na=False)]
@@ -30,10 +92,32 @@ def index():
     if source:
         df = df[df["source"].str.lower().str.contains(source, na=False)]
 
-    jobs = df.sort_values(by="scraped_at", ascending=False).to_dict(orient="records")
+    offset = (page - 1) * PAGE_SIZE
+    df = df.sort_values(by="scraped_at", ascending=False).iloc[offset:offset + PAGE_SIZE + 1]
+    jobs = df.to_dict(orient="records")
+
+    return jobs[:PAGE_SIZE], len(jobs) > PAGE_SIZE
+
+
+@app.route("/")
+def index():
+    keyword = request.args.get("keyword", "").lower()
+    location = request.args.get("location", "").lower()
+    source = request.args.get("source", "").lower()
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    jobs, has_more = load_jobs(keyword, location, source, page)
 
-    return render_template("index.html", jobs=jobs)
+    return render_template(
+        "index.html",
+        jobs=jobs,
+        page=page,
+        has_more=has_more,
+        keyword=keyword,
+        location=location,
+        source=source
+    )
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
@@ -1,164 +1,48 @@
 import time
-import os
-import pandas as pd
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-
-CSV_FILE = "jobs.csv"
-
-
-# ==============================
-# Export (csv @ root folder)
-# ==============================
-def save_to_csv(jobs):
-    new_df = pd.DataFrame(jobs)
-
-    if os.path.exists(CSV_FILE):
-        existing_df = pd.read_csv(CSV_FILE)
-        combined = pd.concat([existing_df, new_df], ignore_index=True)
-    else:
-        combined = new_df
-
-    # Das hier eliminiert duplikate WENN der Inhalt ALLER Felder identisch ist
-    text_fields = ["title", "company", "location", "link", "source"]
-    combined.drop_duplicates(subset=text_fields, inplace=True)
-
-    combined.to_csv(CSV_FILE, index=False)
-
-
-# ==============================
-# JOBS.CH
-# ==============================
-def scrape_jobs_ch(page, keyword, location, max_pages=100):
-    jobs = []
-
-    for p in range(1, max_pages + 1):
-        url = f"https://www.jobs.ch/en/vacancies/?term={keyword}&location={location}&page={p}"
-        print(f"[jobs.ch] Page {p}")
-
-        page.goto(url, timeout=60000)
-        page.wait_for_timeout(3000)
-
-        cards = page.query_selector_all("a[data-cy='job-link']")
-        if not cards:
-            break
-
-        for card in cards:
-            title = card.inner_text().strip()
-            link = "https://www.jobs.ch" + card.get_attribute("href")
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobs.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-    return jobs
-
-
-# ==============================
-# INDEED CH
-# ==============================
-def scrape_indeed(page, keyword, location, max_pages=100):
-    jobs = []
-
-    for p in range(max_pages):
-        start = p * 10
-        url = f"https://ch.indeed.com/jobs?q={keyword}&l={location}&start={start}"
-        print(f"[indeed] Page {p + 1}")
-
-        page.goto(url, timeout=60000)
-        page.wait_for_timeout(4000)
+import os
+import sys
 
-        cards = page.query_selector_all("a.tapItem")
-        if not cards:
-            break
+# Shared with the Jobman scrapers, one copy of each module lives there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Jobman"))
 
-        for card in cards:
-            title_el = card.query_selector("h2 span")
-            company_el = card.query_selector(".companyName")
-            location_el = card.query_selector(".companyLocation")
+from csv_store import append_jobs
+from parquet_store import save_parquet
+from playwright_multisite import collect_jobs
 
-            title = title_el.inner_text().strip() if title_el else ""
-            company = company_el.inner_text().strip() if company_el else ""
-            job_loc = location_el.inner_text().strip() if location_el else ""
+CSV_FILE = "jobs.csv"
 
-            link = card.get_attribute("href")
-            if link and not link.startswith("http"):
-                link = "https://ch.indeed.com" + link
+DEDUPE_FIELDS = ["title", "company", "location", "link", "source"]
 
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": job_loc,
-                "link": link,
-                "source": "indeed.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+KEYWORD = "ICT"
+LOCATION = ""
+MAX_PAGES = 100
 
-    return jobs
+# (site, keyword, location), the sites are described in site_registry.SITES
+SOURCES = [
+    ("jobs.ch", KEYWORD, LOCATION),
+    ("indeed.ch", KEYWORD, LOCATION),
+    ("jobscout24.ch", KEYWORD, LOCATION)
+]
 
 
 # ==============================
-# JOBSCOUT24
+# Export (csv @ root folder)
 # ==============================
-def scrape_jobscout24(page, keyword, location, max_pages=100):
-    jobs = []
-
-    for p in range(1, max_pages + 1):
-        url = f"https://www.jobscout24.ch/en/jobs?term={keyword}&location={location}&page={p}"
-        print(f"[jobscout24] Page {p}")
-
-        page.goto(url, timeout=60000)
-        page.wait_for_timeout(4000)
-
-        cards = page.query_selector_all("a[href*='/en/job/']")
-        if not cards:
-            break
-
-        for card in cards:
-            title = card.inner_text().strip()
-            link = card.get_attribute("href")
-
-            if link and not link.startswith("http"):
-                link = "https://www.jobscout24.ch" + link
-
-            jobs.append({
-                "title": title,
-                "company": "",
-                "location": location,
-                "link": link,
-                "source": "jobscout24.ch",
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-    return jobs
+def save_to_csv(jobs):
+    new_jobs = append_jobs(jobs, DEDUPE_FIELDS, CSV_FILE)
+    save_parquet(new_jobs, CSV_FILE)
+    print(f"CSV updated. {len(new_jobs)} new entries.")
 
 
 # ==============================
-# Die Maschine
+# MAIN SCRAPER
 # ==============================
 def run_scraper():
     print(f"\nRunning scraper at {datetime.now()}")
 
-    keyword = "ICT"
-    location = ""
-
-    all_jobs = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-
-        all_jobs.extend(scrape_jobs_ch(page, keyword, location))
-        all_jobs.extend(scrape_indeed(page, keyword, location))
-        all_jobs.extend(scrape_jobscout24(page, keyword, location))
-
-        browser.close()
+    # Same engine, extractors and waits as Jobman/playwright_multisite.py
+    all_jobs = collect_jobs(SOURCES, MAX_PAGES)
 
     if all_jobs:
         save_to_csv(all_jobs)
@@ -175,4 +59,3 @@ if __name__ == "__main__":
         run_scraper()
         print("Sleeping for 4 hours...\n")
         time.sleep(4 * 60 * 60)
-